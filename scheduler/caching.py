@@ -0,0 +1,144 @@
+"""
+Catalog version counter, the schedule result cache and pre-rendered catalog
+payloads.
+
+Every course/section write bumps the catalog version (see signals.py), and
+the version is part of every result and payload key, so stale entries are
+never served; they just age out of the cache. Results and payloads live in
+Django's cache framework, which is locmem (per process) unless
+settings.CACHES says otherwise. The version itself is a CatalogVersion row,
+so a write handled by one worker process invalidates every process's
+caches, catalog snapshot and solver sessions. Reads go through the cache
+too (SCHEDULE_CATALOG_VERSION_TTL seconds), so serving a request costs no
+query: a bump is seen at once by processes sharing the cache, and by the
+others within the TTL.
+"""
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import CatalogVersion
+
+CATALOG_VERSION_KEY = "scheduler:catalog_version"
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _fresh_version():
+    # If the row goes missing, restart from the clock instead of 1 so old
+    # keys can never be reused.
+    return time.time_ns()
+
+
+def _read_version():
+    version = CatalogVersion.objects.filter(pk=1).values_list('value', flat=True).first()
+    if version is None:
+        version = CatalogVersion.objects.get_or_create(pk=1, defaults={'value': _fresh_version()})[0].value
+    cache.set(CATALOG_VERSION_KEY, version, timeout=getattr(settings, "SCHEDULE_CATALOG_VERSION_TTL", 5))
+    return version
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = _read_version()
+    return version
+
+
+def bump_catalog_version():
+    CatalogVersion.objects.filter(pk=1).update(value=F('value') + 1)
+    # a missing row starts over from the clock
+    return _read_version()
+
+
+def normalize_preferences(prefs):
+    """
+    Drop empty preferences (they mean "no preference") and sort list values,
+    so equivalent preference dicts produce the same key.
+    """
+    normalized = {}
+    for key, value in (prefs or {}).items():
+        if value in (None, "", []):
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(v) for v in value)
+        normalized[key] = value
+    return normalized
+
+
+def schedule_cache_key(selected_ids, prefs, **options):
+    payload = json.dumps({
+        "courses": sorted({str(i) for i in selected_ids}),
+        "preferences": normalize_preferences(prefs),
+        "options": options,
+    }, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"scheduler:schedules:{get_catalog_version()}:{digest}"
+
+
+def lookup_schedules(key):
+    """
+    (True, result) if key is cached, else (False, None). Counts a hit or
+    a miss in cache_stats().
+    """
+    hit = cache.get(key)
+    with _stats_lock:
+        _stats["hits" if hit is not None else "misses"] += 1
+    if hit is not None:
+        return True, hit[0]
+    return False, None
+
+
+def store_schedules(key, result):
+    timeout = getattr(settings, "SCHEDULE_CACHE_TIMEOUT", 300)
+    cache.set(key, (result,), timeout=timeout)
+
+
+def cached_schedules(key, compute, cacheable=None):
+    """
+    Return the cached result for key, or compute(), store and return it.
+    None is a valid (cacheable) result: "no schedule". Results for which
+    cacheable(result) is false (e.g. cut short by a time budget) are
+    returned but not stored.
+    """
+    hit, result = lookup_schedules(key)
+    if hit:
+        return result
+
+    result = compute()
+    if cacheable is None or cacheable(result):
+        store_schedules(key, result)
+    return result
+
+
+def catalog_payload(name, render):
+    """
+    Pre-rendered response body for a catalog listing, as a dict with
+    "body" (bytes), "etag" (strong, quoted) and "last_modified" (epoch
+    seconds). render() builds the body and only runs when the current
+    catalog version has no entry yet.
+    """
+    key = f"scheduler:catalog:{name}:{get_catalog_version()}"
+    payload = cache.get(key)
+    if payload is None:
+        body = render()
+        payload = {
+            "body": body,
+            "etag": '"%s"' % hashlib.sha1(body).hexdigest(),
+            "last_modified": int(time.time()),
+        }
+        cache.set(key, payload, timeout=None)
+    return payload
+
+
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["catalog_version"] = get_catalog_version()
+    return stats
@@ -0,0 +1,195 @@
+"""
+Bulk catalog import shared by `manage.py import_catalog` and the bulk API.
+
+Each row describes one section and the course it belongs to:
+
+    course_code, course_title, credits, section_number, instructor,
+    days, start_time, end_time
+
+Courses are matched by code; unknown codes create a course from the row's
+title and credits (existing courses are never modified). All rows are
+validated first, including overlaps between sections of the same course,
+and nothing is written unless every row is valid.
+"""
+import csv
+import io
+import json
+import re
+
+from django.db import transaction
+from django.utils.dateparse import parse_time
+
+from .models import Course, CourseSection
+from .utils import DAY_CODES, meeting_mask, parse_days, time_to_minutes
+from .conflicts import register_patterns, section_pattern_key
+from .caching import bump_catalog_version
+
+IMPORT_FIELDS = [
+    'course_code', 'course_title', 'credits', 'section_number',
+    'instructor', 'days', 'start_time', 'end_time',
+]
+
+
+def read_rows(data, fmt):
+    """
+    Parse CSV text (with a header row) or JSON (a list of row objects, or
+    {"rows": [...]}) into a list of dicts.
+    """
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(data)))
+    if fmt == 'json':
+        rows = json.loads(data)
+        if isinstance(rows, dict):
+            rows = rows.get('rows', [])
+        return rows
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _clean_days(value):
+    if isinstance(value, str):
+        value = [d for d in re.split(r"[\s,;/]+", value) if d]
+    return parse_days(value)
+
+
+def _clean_time(value, name, errors):
+    try:
+        parsed = parse_time(str(value or "").strip())
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        errors.append(f"{name} must be a time like 09:00.")
+    return parsed
+
+
+def clean_row(row):
+    """
+    Return (cleaned, errors) for one row.
+    """
+    errors = []
+    if not isinstance(row, dict):
+        return None, ["Row must be an object."]
+
+    def get(key):
+        value = row.get(key)
+        return "" if value is None else value
+
+    code = str(get('course_code')).strip()
+    section_number = str(get('section_number')).strip()
+    if not code:
+        errors.append("course_code is required.")
+    if not section_number:
+        errors.append("section_number is required.")
+
+    credits = None
+    if str(get('credits')).strip():
+        try:
+            credits = int(get('credits'))
+        except (TypeError, ValueError):
+            errors.append("credits must be an integer.")
+
+    days = _clean_days(get('days'))
+    if not days:
+        errors.append("days is required.")
+    bad_days = [d for d in days if d not in DAY_CODES]
+    if bad_days:
+        errors.append(f"Unknown days: {', '.join(bad_days)}.")
+
+    start_time = _clean_time(get('start_time'), 'start_time', errors)
+    end_time = _clean_time(get('end_time'), 'end_time', errors)
+    if start_time and end_time and start_time >= end_time:
+        errors.append("Start time must be before end time.")
+
+    cleaned = {
+        'course_code': code,
+        'course_title': str(get('course_title')).strip(),
+        'credits': credits,
+        'section_number': section_number,
+        'instructor': str(get('instructor')).strip(),
+        'days': days,
+        'start_time': start_time,
+        'end_time': end_time,
+    }
+    return cleaned, errors
+
+
+def import_catalog(rows, dry_run=False):
+    """
+    Validate and write `rows`. Returns
+    {"courses_created": n, "sections_created": n, "errors": [{"row": i, "errors": [...]}]}
+    where rows are numbered from 1. Nothing is written if there are errors
+    or dry_run is set.
+    """
+    errors = {}
+    cleaned = []
+    for i, row in enumerate(rows, start=1):
+        data, row_errors = clean_row(row)
+        if row_errors:
+            errors[i] = row_errors
+        else:
+            cleaned.append((i, data))
+
+    # courses: existing ones by code, new ones from the first row that names them
+    codes = {data['course_code'] for _, data in cleaned}
+    courses = {}
+    for course in Course.objects.filter(code__in=codes).order_by('id'):
+        courses.setdefault(course.code, course)
+    new_courses = {}
+    for i, data in cleaned:
+        code = data['course_code']
+        if code in courses or code in new_courses:
+            continue
+        if not data['course_title']:
+            errors.setdefault(i, []).append(f"Unknown course {code}: course_title is required to create it.")
+            continue
+        new_courses[code] = Course(
+            code=code, title=data['course_title'],
+            credits=data['credits'] if data['credits'] is not None else 3,
+        )
+
+    # overlaps between sections of the same course, existing ones included
+    taken = {}  # code -> [(mask, label)]
+    existing = CourseSection.objects.filter(course__in=courses.values()).select_related('course')
+    for sec in existing.only('section_number', 'days', 'start_time', 'end_time', 'course__code'):
+        mask = meeting_mask(parse_days(sec.days), time_to_minutes(sec.start_time), time_to_minutes(sec.end_time))
+        label = f"section {sec.section_number} ({sec.start_time}-{sec.end_time} on {sec.days})"
+        taken.setdefault(sec.course.code, []).append((mask, label))
+    for i, data in cleaned:
+        mask = meeting_mask(data['days'], time_to_minutes(data['start_time']), time_to_minutes(data['end_time']))
+        siblings = taken.setdefault(data['course_code'], [])
+        clash = next((label for other, label in siblings if mask & other), None)
+        if clash:
+            errors.setdefault(i, []).append(f"Time conflict with {clash}.")
+        siblings.append((mask, f"section {data['section_number']} (row {i})"))
+
+    result = {
+        "courses_created": 0,
+        "sections_created": 0,
+        "errors": [{"row": i, "errors": errors[i]} for i in sorted(errors)],
+    }
+    if errors or dry_run:
+        return result
+
+    with transaction.atomic():
+        Course.objects.bulk_create(new_courses.values(), batch_size=1000)
+        courses.update(new_courses)
+        sections = [
+            CourseSection(
+                course=courses[data['course_code']],
+                section_number=data['section_number'],
+                instructor=data['instructor'],
+                days=data['days'],
+                start_time=data['start_time'],
+                end_time=data['end_time'],
+            )
+            for _, data in cleaned
+        ]
+        # bulk_create skips save() and signals, so do their work here
+        for s in sections:
+            s.sync_meeting_columns()
+        sections = CourseSection.objects.bulk_create(sections, batch_size=1000)
+        register_patterns(section_pattern_key(s) for s in sections)
+        transaction.on_commit(bump_catalog_version)
+
+    result["courses_created"] = len(new_courses)
+    result["sections_created"] = len(sections)
+    return result
@@ -0,0 +1,66 @@
+"""
+Catalog conflict report.
+
+Meetings are swept per weekday in start order while a heap holds the ones
+still running, so finding every overlapping pair costs
+O(n log n + conflicts) instead of testing all n(n-1)/2 pairs.
+"""
+import heapq
+
+from .utils import DAY_CODES, get_section_days, time_to_minutes
+
+
+def sweep_day(meetings):
+    """
+    Yield (a, b) for every overlapping pair among `meetings`, a list of
+    (start_min, end_min, section) on one day.
+    """
+    meetings = sorted(meetings, key=lambda m: (m[0], m[1], m[2].pk))
+    running = []  # heap of (end_min, pk, section)
+    for start, end, section in meetings:
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        for _, _, other in running:
+            yield other, section
+        heapq.heappush(running, (end, section.pk, section))
+
+
+def find_conflicts(sections, course_id=None, instructor=None, day=None):
+    """
+    Return [(section_a, section_b, days)] for every overlapping pair, with
+    section_a.pk < section_b.pk, sorted by (a, b). days lists the weekdays
+    the two meet at the same time.
+
+    Filters keep pairs where at least one section is in course `course_id`
+    or taught by `instructor` (case-insensitive), and only overlaps on
+    `day`. Every section is still swept, since the other side of a pair
+    can be anything.
+    """
+    by_day = {}
+    for s in sections:
+        start, end = time_to_minutes(s.start_time), time_to_minutes(s.end_time)
+        if start is None or end is None or start >= end:
+            continue
+        for d in get_section_days(s):
+            if day is None or d == day:
+                by_day.setdefault(d, []).append((start, end, s))
+
+    instructor = instructor.strip().lower() if instructor else None
+
+    def wanted(s):
+        if course_id is not None and str(s.course_id) != str(course_id):
+            return False
+        if instructor is not None and (s.instructor or "").strip().lower() != instructor:
+            return False
+        return True
+
+    found = {}
+    for d in DAY_CODES:
+        for a, b in sweep_day(by_day.get(d, [])):
+            if not (wanted(a) or wanted(b)):
+                continue
+            if a.pk > b.pk:
+                a, b = b, a
+            found.setdefault((a.pk, b.pk), (a, b, []))[2].append(d)
+
+    return [found[key] for key in sorted(found)]
@@ -0,0 +1,94 @@
+"""
+Persisted conflict graph.
+
+Sections that share days, start and end time share a MeetingPattern, and
+the graph is stored between patterns: a catalog has far fewer distinct
+patterns than sections, so the table stays small even when thousands of
+sections overlap each other. Writes only register the (rare) new pattern
+against the existing ones, and readers look pairs up instead of re-testing
+meeting times.
+"""
+from .models import CourseSection, MeetingPattern
+from .utils import DAY_CODES, meeting_mask, parse_days, time_to_minutes
+
+
+def pattern_key(days, start_min, end_min):
+    """'M,W|540|615' for days ['W','M'] from 09:00 to 10:15."""
+    ordered = [d for d in DAY_CODES if d in set(days)]
+    return f"{','.join(ordered)}|{start_min}|{end_min}"
+
+
+def section_pattern_key(section):
+    return pattern_key(
+        parse_days(section.days),
+        time_to_minutes(section.start_time),
+        time_to_minutes(section.end_time),
+    )
+
+
+def key_mask(key):
+    days, start, end = key.split("|")
+    if start == "None" or end == "None":
+        return 0
+    return meeting_mask(days.split(",") if days else [], int(start), int(end))
+
+
+def register_patterns(keys):
+    """
+    Make sure every pattern key is in the graph, linking each new pattern to
+    the existing patterns it overlaps (itself included).
+    """
+    keys = set(keys)
+    known = set(MeetingPattern.objects.filter(key__in=keys).values_list('key', flat=True))
+    missing = sorted(keys - known)
+    if not missing:
+        return
+    # existing patterns are read (and their masks built) once per call
+    existing = [(p, key_mask(p.key)) for p in MeetingPattern.objects.only('id', 'key')]
+    for key in missing:
+        pattern, created = MeetingPattern.objects.get_or_create(key=key)
+        if not created:
+            continue
+        mask = key_mask(key)
+        existing.append((pattern, mask))
+        if not mask:
+            continue
+        pattern.conflicts.add(*[other for other, other_mask in existing if mask & other_mask])
+
+
+def rebuild_conflict_index():
+    """
+    Rebuild the whole graph from the current sections.
+    """
+    MeetingPattern.objects.all().delete()
+    register_patterns(section_pattern_key(s) for s in CourseSection.objects.only('days', 'start_time', 'end_time'))
+
+
+def conflict_adjacency(sections):
+    """
+    Return {section_id: set of conflicting section ids} restricted to `sections`.
+    """
+    sections = list(sections)
+    by_key = {}
+    for s in sections:
+        by_key.setdefault(section_pattern_key(s), []).append(s.pk)
+    # writes that skip save() (QuerySet.update, bulk loads) may have left
+    # patterns unregistered
+    register_patterns(by_key)
+
+    adjacency = {s.pk: set() for s in sections}
+    through = MeetingPattern.conflicts.through
+    pairs = (
+        through.objects
+        .filter(from_meetingpattern__key__in=by_key, to_meetingpattern__key__in=by_key)
+        .values_list('from_meetingpattern__key', 'to_meetingpattern__key')
+    )
+    for a, b in pairs:
+        for sid in by_key[a]:
+            adjacency[sid].update(by_key[b])
+        for sid in by_key[b]:
+            adjacency[sid].update(by_key[a])
+    # a section never conflicts with itself
+    for sid, others in adjacency.items():
+        others.discard(sid)
+    return adjacency
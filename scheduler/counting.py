@@ -0,0 +1,225 @@
+"""
+Count valid schedules without enumerating them.
+
+A schedule takes at most one section per course, has no time conflicts,
+totals MIN_CREDITS..MAX_CREDITS over MIN_SECTIONS..MAX_SECTIONS sections
+and passes max_classes_per_day (the per-section hard preferences are
+applied to the sections beforehand, see prefilter.py).
+
+ScheduleCounter walks the courses once, like the search, but memoizes on
+(course, time still relevant to the remaining courses, credits, size):
+two partial schedules that leave the rest of the selection in the same
+position have the same number of completions. Sections with the same
+meeting pattern are counted once and multiplied, and the occupied time
+is kept as the set of patterns it rules out (one bit per pattern), cut
+down to the patterns of the remaining courses: different occupied times
+that block the same later choices share one memo entry. Courses are
+ordered so that ones sharing time come next to each other, so a
+course's bits leave the key soon after it is placed.
+
+If the `stop` callback fires, the count so far is a lower bound and the
+conflict-free count (credits and size only) an upper bound.
+"""
+import time
+
+from .search import (MAX_CREDITS, MAX_SECTIONS, MIN_CREDITS, MIN_SECTIONS, SectionRecord,
+                     best_sums, group_by_course)
+from .utils import DAY_CODES, section_mask
+
+# how many nodes to visit between calls to the `stop` callback
+STOP_CHECK_INTERVAL = 256
+
+
+class CountStopped(Exception):
+    """Raised inside the count when its `stop` callback returns True."""
+
+
+def _bits(mask):
+    return bin(mask).count("1")
+
+
+def max_classes_per_day(prefs):
+    """The max_classes_per_day preference as an int, or None if unset or invalid."""
+    value = (prefs or {}).get("max_classes_per_day") or None
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CourseOptions:
+    """One course's distinct meeting patterns: [(mask, day indexes, sections)]."""
+    __slots__ = ('course_id', 'credits', 'required', 'patterns', 'mask')
+
+    def __init__(self, course_id, credits, required, patterns):
+        self.course_id = course_id
+        self.credits = credits
+        self.required = required
+        self.patterns = patterns
+        self.mask = 0
+        for mask, _, _ in patterns:
+            self.mask |= mask
+
+    @property
+    def sections(self):
+        return sum(n for _, _, n in self.patterns)
+
+
+class ScheduleCounter:
+    """
+    Count the schedules of `sections` (CourseSections with course loaded,
+    or SectionRecords) that ScheduleSearch would find with `prefs`.
+    `required` course ids must be in every schedule.
+    """
+
+    def __init__(self, sections, prefs=None, required=None, stop=None,
+                 min_credits=MIN_CREDITS, max_credits=MAX_CREDITS,
+                 min_sections=MIN_SECTIONS, max_sections=MAX_SECTIONS):
+        records = [SectionRecord.from_section(s) for s in sections]
+        required = set(required or ())
+        self.stop = stop
+        self.min_credits = min_credits
+        self.max_credits = max_credits
+        self.min_sections = min_sections
+        self.max_sections = max_sections
+        self.max_per_day = max_classes_per_day(prefs)
+
+        courses = []
+        for group in group_by_course(range(len(records)), records):
+            patterns = {}
+            for pos in group:
+                r = records[pos]
+                key = (section_mask(r), tuple(DAY_CODES.index(d) for d in r.days if d in DAY_CODES))
+                patterns[key] = patterns.get(key, 0) + 1
+            first = records[group[0]]
+            courses.append(CourseOptions(first.course_id, first.credits, first.course_id in required,
+                                         [(mask, days, n) for (mask, days), n in patterns.items()]))
+        self.impossible = bool(required - {c.course_id for c in courses})
+        self.courses = self._order(courses)
+
+        # options[k]: [(pattern bit, patterns it blocks, day indexes, sections)]
+        patterns = [(mask, days, n) for c in self.courses for mask, days, n in c.patterns]
+        blocks = [0] * len(patterns)
+        for i, (mask, _, _) in enumerate(patterns):
+            for j in range(i + 1, len(patterns)):
+                if mask & patterns[j][0]:
+                    blocks[i] |= 1 << j
+                    blocks[j] |= 1 << i
+        self.options = []
+        bit = 0
+        for c in self.courses:
+            self.options.append([(1 << (bit + i), blocks[bit + i], days, n)
+                                 for i, (_, days, n) in enumerate(c.patterns)])
+            bit += len(c.patterns)
+
+        # rest[k]: patterns of courses k..end; need[k]: required courses k..end
+        n = len(self.courses)
+        self.rest = [0] * (n + 1)
+        self.need = [0] * (n + 1)
+        for k in range(n - 1, -1, -1):
+            self.rest[k] = self.rest[k + 1] | sum(own for own, _, _, _ in self.options[k])
+            self.need[k] = self.need[k + 1] + self.courses[k].required
+        self.reach = [best_sums([c.credits for c in self.courses[k:]]) for k in range(n + 1)]
+        self.stats = {}
+        self.found = 0
+
+    @staticmethod
+    def _order(courses):
+        """
+        Start with the course that shares the most time with the others,
+        then keep taking the one sharing most with the courses placed so
+        far (ties: fewer patterns first).
+        """
+        ordered = []
+        left = list(courses)
+        placed = 0
+        while left:
+            if ordered:
+                best = max(left, key=lambda c: (_bits(c.mask & placed), -len(c.patterns)))
+            else:
+                best = max(left, key=lambda c: (sum(_bits(c.mask & o.mask) for o in left if o is not c),
+                                                -len(c.patterns)))
+            left.remove(best)
+            ordered.append(best)
+            placed |= best.mask
+        return ordered
+
+    def count(self):
+        """
+        {"count": n, "exact": True} or, if stopped early,
+        {"exact": False, "lower_bound": n, "upper_bound": n}.
+        """
+        self.stats = {"nodes": 0, "memo_hits": 0}
+        self.found = 0
+        started = time.perf_counter()
+        days = (0,) * len(DAY_CODES) if self.max_per_day else None
+        try:
+            if self.impossible:
+                result = {"count": 0, "exact": True}
+            else:
+                result = {"count": self._count(0, 0, 0, 0, days, {}, 1), "exact": True}
+        except CountStopped:
+            result = {"exact": False, "lower_bound": self.found, "upper_bound": self.upper_bound()}
+        self.stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    def _count(self, k, blocked, credits, size, days, memo, weight):
+        """
+        Completions of a partial schedule at course k. `weight` is how many
+        section-level partial schedules this one stands for; it only feeds
+        self.found, the lower bound reported if the count is stopped.
+        """
+        stats = self.stats
+        stats["nodes"] += 1
+        if self.stop is not None and stats["nodes"] % STOP_CHECK_INTERVAL == 0 and self.stop():
+            raise CountStopped()
+
+        slots = self.max_sections - size
+        if self.need[k] > slots:
+            return 0
+        if credits + self.reach[k][min(slots, len(self.reach[k]) - 1)] < self.min_credits:
+            return 0
+        if k == len(self.courses) or slots == 0:
+            valid = size >= self.min_sections and credits >= self.min_credits
+            self.found += weight if valid else 0
+            return int(valid)
+
+        key = (k, blocked & self.rest[k], credits, size, days)
+        if key in memo:
+            stats["memo_hits"] += 1
+            self.found += memo[key] * weight
+            return memo[key]
+
+        course = self.courses[k]
+        total = 0
+        if not course.required:
+            total += self._count(k + 1, blocked, credits, size, days, memo, weight)
+        if credits + course.credits <= self.max_credits:
+            for own, blocks, day_indexes, n in self.options[k]:
+                if own & blocked:
+                    continue
+                taken = days
+                if days is not None:
+                    taken = list(days)
+                    for d in day_indexes:
+                        taken[d] += 1
+                    if max(taken) > self.max_per_day:
+                        continue
+                    taken = tuple(taken)
+                total += n * self._count(k + 1, blocked | blocks, credits + course.credits, size + 1,
+                                         taken, memo, weight * n)
+        memo[key] = total
+        return total
+
+    def upper_bound(self):
+        """Schedules counting credits and size only, as if nothing clashed."""
+        ways = {(0, 0): 1}
+        for course in self.courses:
+            step = {} if course.required else dict(ways)
+            for (credits, size), n in ways.items():
+                key = (credits + course.credits, size + 1)
+                if key[0] <= self.max_credits and size < self.max_sections:
+                    step[key] = step.get(key, 0) + n * course.sections
+            ways = step
+        return sum(n for (credits, size), n in ways.items()
+                   if credits >= self.min_credits and size >= self.min_sections)
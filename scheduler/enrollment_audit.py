@@ -0,0 +1,70 @@
+"""
+Timetable clash audit for a term's enrollments.
+
+All of a term's enrollments come back in one query, ordered by student,
+carrying each section's day_mask/start_min/end_min columns. Each student's
+sections are then swept per weekday (conflict_report.sweep_day), so the
+cost is linear in enrollments plus clashes, with no per-student queries
+and no pairwise has_conflict calls.
+"""
+from collections import namedtuple
+from itertools import groupby
+
+from .conflict_report import sweep_day
+from .models import Enrollment
+from .utils import DAY_BITS, DAY_CODES
+
+EnrolledSection = namedtuple('EnrolledSection', 'pk course section_number day_mask start_min end_min')
+
+AUDIT_COLUMNS = (
+    'student_id', 'student__name', 'section_id', 'section__course__code',
+    'section__section_number', 'section__day_mask', 'section__start_min', 'section__end_min',
+)
+
+
+def term_rows(semester, year, student_id=None):
+    """One query: AUDIT_COLUMNS tuples for the term, grouped by student."""
+    rows = Enrollment.objects.filter(semester=semester, year=year)
+    if student_id is not None:
+        rows = rows.filter(student_id=student_id)
+    return rows.order_by('student_id', 'section_id').values_list(*AUDIT_COLUMNS)
+
+
+def student_clashes(sections):
+    """
+    [(a, b, days)] for every pair of `sections` (EnrolledSections of one
+    student) that meet at the same time, a.pk < b.pk, sorted.
+    """
+    found = {}
+    for d in DAY_CODES:
+        meetings = [(s.start_min, s.end_min, s) for s in sections
+                    if s.day_mask & DAY_BITS[d] and s.start_min < s.end_min]
+        for a, b in sweep_day(meetings):
+            if a.pk > b.pk:
+                a, b = b, a
+            found.setdefault((a.pk, b.pk), (a, b, []))[2].append(d)
+    return [found[key] for key in sorted(found)]
+
+
+def audit_term(semester, year, student_id=None):
+    """
+    Lazily yield one dict per clashing pair of enrolled sections, student
+    by student (in id order):
+
+        {"student": {"id", "name"}, "section_a": {...}, "section_b": {...}, "days": [...]}
+    """
+    rows = term_rows(semester, year, student_id).iterator(chunk_size=2000)
+    for (sid, name), group in groupby(rows, key=lambda r: (r[0], r[1])):
+        sections = {}
+        for _, _, *section in group:
+            # the same section enrolled twice is not a clash
+            sections.setdefault(section[0], EnrolledSection(*section))
+        if len(sections) < 2:
+            continue
+        for a, b, days in student_clashes(list(sections.values())):
+            yield {
+                "student": {"id": sid, "name": name},
+                "section_a": {"id": a.pk, "course": a.course, "section_number": a.section_number},
+                "section_b": {"id": b.pk, "course": b.course, "section_number": b.section_number},
+                "days": days,
+            }
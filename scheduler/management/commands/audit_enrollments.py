@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from scheduler.enrollment_audit import audit_term
+
+
+class Command(BaseCommand):
+    help = "List every pair of clashing sections a student is enrolled in for a term."
+
+    def add_arguments(self, parser):
+        parser.add_argument('semester', help="e.g. Fall")
+        parser.add_argument('year', type=int)
+        parser.add_argument('--student', type=int, help="only this student id")
+        parser.add_argument('--format', choices=['text', 'ndjson'], default='text')
+
+    def handle(self, *args, **options):
+        count = 0
+        for clash in audit_term(options['semester'], options['year'], options['student']):
+            count += 1
+            if options['format'] == 'ndjson':
+                self.stdout.write(json.dumps(clash))
+                continue
+            a, b = clash['section_a'], clash['section_b']
+            self.stdout.write(
+                f"{clash['student']['name']} (#{clash['student']['id']}): "
+                f"{a['course']}-{a['section_number']} clashes with "
+                f"{b['course']}-{b['section_number']} on {', '.join(clash['days'])}"
+            )
+        self.stderr.write(self.style.SUCCESS(f"{count} clashes."))
@@ -0,0 +1,174 @@
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from scheduler import views
+from scheduler.caching import bump_catalog_version
+from scheduler.catalog_import import import_catalog
+from scheduler.models import Course, MeetingPattern
+from scheduler.synthetic import synthetic_rows
+
+# preference mixes sent to the schedule generator
+PREFERENCE_MIXES = {
+    "none": {},
+    "morning": {"preferred_time": "morning"},
+    "strict": {"earliest_start": "09:30", "avoid_days": ["F"], "max_classes_per_day": "2"},
+}
+
+
+def parse_sizes(value):
+    """'50x4,200x5' -> [(50, 4), (200, 5)]"""
+    try:
+        sizes = [tuple(int(n) for n in part.split('x')) for part in value.split(',') if part.strip()]
+    except ValueError:
+        sizes = []
+    if not sizes or any(len(s) != 2 or min(s) < 1 for s in sizes):
+        raise ValueError
+    return sizes
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the schedule generator, conflict demo and catalog listings "
+            "over synthetic catalogs of several sizes, in a throwaway test database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes("20x3,100x4,500x5"),
+                            help="comma-separated COURSESxSECTIONS catalogs (default 20x3,100x4,500x5)")
+        parser.add_argument('--select', type=int, default=6,
+                            help="courses sent to the schedule generator")
+        parser.add_argument('--density', type=float, default=0.5)
+        parser.add_argument('--repeat', type=int, default=5, help="timed runs per case")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['select'] < 1:
+            raise CommandError("--repeat and --select must be at least 1.")
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = []
+            for courses, sections in options['sizes']:
+                self.load_catalog(courses, sections, options)
+                for case, run in self.cases(options['select']):
+                    row = {"catalog": f"{courses}x{sections}", "case": case,
+                           **self.measure(run, options['repeat'])}
+                    results.append(row)
+                    self.stdout.write(
+                        f"{row['catalog']:>10}  {case:<20} p50 {row['latency_ms']['p50']:>9.2f} ms"
+                        f"  p95 {row['latency_ms']['p95']:>9.2f} ms  peak {row['peak_kb']:>9.1f} KiB"
+                        f"  {row['queries']:>3} queries"
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "density": options['density'],
+                "repeat": options['repeat'],
+                "select": options['select'],
+                "seed": options['seed'],
+            },
+            "results": results,
+        }
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}."))
+
+    def load_catalog(self, courses, sections, options):
+        Course.objects.all().delete()
+        MeetingPattern.objects.all().delete()
+        try:
+            rows = synthetic_rows(courses, sections, density=options['density'], seed=options['seed'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        result = import_catalog(rows)
+        if result['errors']:
+            raise CommandError(f"Synthetic catalog did not import: {result['errors'][0]}")
+
+    def cases(self, select):
+        """(name, callable) pairs; each callable makes one request."""
+        client = Client()
+        factory = RequestFactory()
+        selected = list(Course.objects.order_by('id').values_list('id', flat=True)[:select])
+
+        def generate(prefs):
+            return lambda: client.post('/api/generate-schedules/', {
+                "selected_courses": selected, "preferences": prefs, "top_k": 5,
+            }, content_type='application/json')
+
+        cases = [(f"generate:{name}", generate(prefs)) for name, prefs in PREFERENCE_MIXES.items()]
+        cases += [
+            ("conflict_demo", lambda: views.check_conflict_demo(factory.get('/'))),
+            ("sections_list", lambda: client.get('/api/sections/')),
+            ("courses_list", lambda: client.get('/api/courses/')),
+        ]
+        return cases
+
+    def make_cold(self):
+        """
+        Drop the cached results and this process's catalog snapshot. The
+        snapshot is reset the way a catalog write resets it, by bumping the
+        catalog version, so the next request reloads it.
+        """
+        cache.clear()
+        bump_catalog_version()
+
+    def measure(self, run, repeat):
+        """
+        Latency percentiles over `repeat` runs, plus the query count and
+        peak traced memory of one more run. Every run starts cold, so
+        each one does the full work.
+        """
+        timings = []
+        for _ in range(repeat):
+            self.make_cold()
+            started = time.perf_counter()
+            response = run()
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"Got HTTP {response.status_code}.")
+        timings.sort()
+
+        self.make_cold()
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "latency_ms": {
+                "p50": round(percentile(timings, 50), 3),
+                "p95": round(percentile(timings, 95), 3),
+                "p99": round(percentile(timings, 99), 3),
+                "max": round(timings[-1], 3),
+                "mean": round(sum(timings) / len(timings), 3),
+            },
+            "peak_kb": round(peak / 1024, 1),
+            "queries": len(queries),
+        }
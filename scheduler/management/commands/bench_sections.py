@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from scheduler.models import CourseSection
+from scheduler.serializers import CourseSectionReadSerializer, SECTION_COLUMNS, section_dicts
+
+
+class Command(BaseCommand):
+    help = ("Time the sections listing: CourseSectionReadSerializer vs the "
+            ".values() fast path, over every section in the database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5,
+                            help="runs per variant; the best one is reported")
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1.")
+
+        def serializer():
+            sections = CourseSection.objects.select_related('course').order_by('id')
+            return JSONRenderer().render(CourseSectionReadSerializer(sections, many=True).data)
+
+        def fast_path():
+            sections = CourseSection.objects.values(*SECTION_COLUMNS).order_by('id')
+            return JSONRenderer().render(section_dicts(sections))
+
+        results = {}
+        for name, render in (("serializer", serializer), ("fast_path", fast_path)):
+            best = None
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                body = render()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (best, body)
+
+        if results["serializer"][1] != results["fast_path"][1]:
+            raise CommandError("The fast path does not match the serializer output.")
+
+        slow, fast = results["serializer"][0], results["fast_path"][0]
+        self.stdout.write(f"{CourseSection.objects.count()} sections")
+        self.stdout.write(f"serializer: {slow * 1000:.1f} ms")
+        self.stdout.write(f"fast path:  {fast * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {slow / fast:.1f}x"))
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.catalog_import import import_catalog
+from scheduler.synthetic import synthetic_rows
+
+
+def credit_list(value):
+    try:
+        credits = [int(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        credits = []
+    if not credits or min(credits) < 1:
+        raise ValueError
+    return credits
+
+
+class Command(BaseCommand):
+    help = ("Generate a reproducible synthetic catalog and import it, "
+            "or write it to a JSON file for import_catalog.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('courses', type=int, help="number of courses")
+        parser.add_argument('sections', type=int, help="sections per course")
+        parser.add_argument('--density', type=float, default=0.5,
+                            help="0 spreads meetings over the whole day, 1 packs them together")
+        parser.add_argument('--credits', type=credit_list, default=[3, 4],
+                            help="comma-separated credit values to draw from (default 3,4)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default="SYN", help="course code prefix")
+        parser.add_argument('--output', help="write the rows to this JSON file instead of importing")
+
+    def handle(self, *args, **options):
+        if options['courses'] < 1 or options['sections'] < 1:
+            raise CommandError("courses and sections must be at least 1.")
+        try:
+            rows = synthetic_rows(
+                options['courses'], options['sections'], density=options['density'],
+                credits=options['credits'], seed=options['seed'], prefix=options['prefix'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(rows), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(rows)} rows to {options['output']}."))
+            return
+
+        result = import_catalog(rows)
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} invalid rows (is the prefix already in use?), "
+                               f"first: {result['errors'][0]}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['courses_created']} courses and {result['sections_created']} sections."
+        ))
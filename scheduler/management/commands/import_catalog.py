@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.catalog_import import import_catalog, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import courses and sections from a CSV or JSON file in one transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV (with header row) or JSON file")
+        parser.add_argument('--format', choices=['csv', 'json'],
+                            help="defaults to the file extension")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="validate only, write nothing")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        fmt = options['format'] or path.suffix.lstrip('.').lower()
+        try:
+            rows = read_rows(path.read_text(encoding='utf-8'), fmt)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        result = import_catalog(rows, dry_run=options['dry_run'])
+
+        for err in result['errors']:
+            self.stderr.write(f"row {err['row']}: {' '.join(err['errors'])}")
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} invalid rows, nothing imported.")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{len(rows)} rows valid (dry run)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Created {result['courses_created']} courses and {result['sections_created']} sections."
+            ))
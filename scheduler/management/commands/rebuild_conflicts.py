@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from scheduler.conflicts import rebuild_conflict_index
+from scheduler.models import MeetingPattern
+
+
+class Command(BaseCommand):
+    help = "Rebuild the meeting-pattern conflict graph from the current sections."
+
+    def handle(self, *args, **options):
+        rebuild_conflict_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {MeetingPattern.objects.count()} meeting patterns."
+        ))
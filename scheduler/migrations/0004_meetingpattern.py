@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+# Frozen copies of the pattern helpers (scheduler/conflicts.py, utils.py) as
+# they were when this migration was written.
+DAY_CODES = ['M', 'T', 'W', 'Th', 'F']
+MINUTES_PER_DAY = 24 * 60
+
+
+def pattern_key(section):
+    days = section.days
+    if not isinstance(days, (list, tuple)):
+        days = [x.strip() for x in str(days or '').split(',') if x.strip()]
+    days = set(days)
+    start = section.start_time.hour * 60 + section.start_time.minute if section.start_time else None
+    end = section.end_time.hour * 60 + section.end_time.minute if section.end_time else None
+    return f"{','.join(d for d in DAY_CODES if d in days)}|{start}|{end}"
+
+
+def key_mask(key):
+    days, start, end = key.split('|')
+    if start == 'None' or end == 'None' or int(start) >= int(end):
+        return 0
+    start, end = int(start), int(end)
+    day_bits = ((1 << (end - start)) - 1) << start
+    mask = 0
+    for d in days.split(',') if days else []:
+        if d in DAY_CODES:
+            mask |= day_bits << (DAY_CODES.index(d) * MINUTES_PER_DAY)
+    return mask
+
+
+def build_patterns(apps, schema_editor):
+    CourseSection = apps.get_model('scheduler', 'CourseSection')
+    MeetingPattern = apps.get_model('scheduler', 'MeetingPattern')
+
+    keys = sorted({pattern_key(s) for s in CourseSection.objects.only('days', 'start_time', 'end_time')})
+    patterns = [MeetingPattern.objects.create(key=key) for key in keys]
+    masks = [key_mask(key) for key in keys]
+    # the historical model does not know the field is symmetrical: store
+    # both directions, as the live model does
+    Through = MeetingPattern.conflicts.through
+    rows = []
+    for i, pattern in enumerate(patterns):
+        for j in range(i + 1):
+            if masks[i] & masks[j]:
+                rows.append(Through(from_meetingpattern_id=pattern.pk, to_meetingpattern_id=patterns[j].pk))
+                if i != j:
+                    rows.append(Through(from_meetingpattern_id=patterns[j].pk, to_meetingpattern_id=pattern.pk))
+    Through.objects.bulk_create(rows, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0003_course_credits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingPattern',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=40, unique=True)),
+                ('conflicts', models.ManyToManyField(blank=True, to='scheduler.meetingpattern')),
+            ],
+        ),
+        migrations.RunPython(build_patterns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+# Frozen copy of scheduler.utils.DAY_BITS as it was when this migration was written.
+DAY_BITS = {'M': 1, 'T': 2, 'W': 4, 'Th': 8, 'F': 16}
+
+
+def minutes(t):
+    return t.hour * 60 + t.minute if t else 0
+
+
+def fill_meeting_columns(apps, schema_editor):
+    CourseSection = apps.get_model('scheduler', 'CourseSection')
+    sections = list(CourseSection.objects.only('days', 'start_time', 'end_time'))
+    for s in sections:
+        days = s.days
+        if not isinstance(days, (list, tuple)):
+            days = [x.strip() for x in str(days or '').split(',') if x.strip()]
+        s.day_mask = sum(DAY_BITS.get(d, 0) for d in set(days))
+        s.start_min = minutes(s.start_time)
+        s.end_min = minutes(s.end_time)
+    CourseSection.objects.bulk_update(sections, ['day_mask', 'start_min', 'end_min'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0004_meetingpattern'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursesection',
+            name='day_mask',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='coursesection',
+            name='end_min',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='coursesection',
+            name='start_min',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_meeting_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='coursesection',
+            index=models.Index(fields=['course', 'start_min'], name='scheduler_c_course__cf7923_idx'),
+        ),
+    ]
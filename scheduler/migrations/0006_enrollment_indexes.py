@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0005_section_meeting_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'semester', 'year'], name='scheduler_e_student_ac40c0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['semester', 'year', 'student'], name='scheduler_e_semeste_4c5392_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from multiselectfield import MultiSelectField
 
+from .utils import day_mask, parse_days, time_to_minutes
+
 class Student(models.Model):
     name = models.CharField(max_length=100)
     major = models.CharField(max_length=100, blank=True)
@@ -18,6 +20,25 @@ class Course(models.Model):
         return f"{self.code} - {self.title}"
 
 
+class CourseSectionQuerySet(models.QuerySet):
+    """
+    Day and time filters on the integer columns, so they run in SQL.
+    Times are minutes after midnight.
+    """
+
+    def meeting_on(self, days):
+        """Sections that meet on at least one of `days`."""
+        return self.alias(_day_hits=models.F('day_mask').bitand(day_mask(days))).filter(_day_hits__gt=0)
+
+    def avoiding(self, days):
+        """Sections that meet on none of `days`."""
+        return self.alias(_day_hits=models.F('day_mask').bitand(day_mask(days))).filter(_day_hits=0)
+
+    def overlapping(self, days, start_min, end_min):
+        """Sections whose meetings overlap the given pattern."""
+        return self.meeting_on(days).filter(start_min__lt=end_min, end_min__gt=start_min)
+
+
 class CourseSection(models.Model):
     DAYS = [
         ('M', 'Monday'),
@@ -34,9 +55,60 @@ class CourseSection(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
 
+    # Derived from days/start_time/end_time on save(); see sync_meeting_columns.
+    day_mask = models.PositiveSmallIntegerField(default=0, editable=False)  # utils.DAY_BITS
+    start_min = models.PositiveSmallIntegerField(default=0, editable=False)
+    end_min = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = CourseSectionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['course', 'start_min']),
+        ]
+
     def __str__(self):
         return f"{self.course.code}-{self.section_number}"
 
+    def sync_meeting_columns(self):
+        """
+        Recompute day_mask/start_min/end_min. save() does this; call it
+        yourself before bulk_create().
+        """
+        self.day_mask = day_mask(parse_days(self.days))
+        self.start_min = time_to_minutes(self.start_time) or 0
+        self.end_min = time_to_minutes(self.end_time) or 0
+
+    def save(self, *args, **kwargs):
+        self.sync_meeting_columns()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'day_mask', 'start_min', 'end_min'}
+        super().save(*args, **kwargs)
+
+
+class MeetingPattern(models.Model):
+    """
+    A distinct (days, start, end) meeting time, keyed like 'M,W|540|615'.
+    `conflicts` links patterns that overlap; see scheduler/conflicts.py.
+    """
+    key = models.CharField(max_length=40, unique=True)
+    conflicts = models.ManyToManyField('self', symmetrical=True, blank=True)
+
+    def __str__(self):
+        return self.key
+
+
+class CatalogVersion(models.Model):
+    """
+    The catalog version counter (see scheduler/caching.py): a single row,
+    so every worker process sees the same version.
+    """
+    value = models.BigIntegerField()
+
+    def __str__(self):
+        return str(self.value)
+
 
 class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
@@ -44,9 +116,12 @@ class Enrollment(models.Model):
     semester = models.CharField(max_length=20)
     year = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'semester', 'year']),
+            # the term audit scans one term in student order
+            models.Index(fields=['semester', 'year', 'student']),
+        ]
+
     def __str__(self):
         return f"{self.student.name} -> {self.section}"
-
-
-
-
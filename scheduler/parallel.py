@@ -0,0 +1,135 @@
+"""
+Parallel schedule search across worker processes.
+
+The search space is split on the course with the fewest meeting-pattern
+classes: each part fixes that course to one class (or leaves it out) and runs
+in a ProcessPoolExecutor worker over a picklable SectionRecord snapshot.
+Every part returns its own top K, and merging them gives exactly the
+serial top K because all parts rank schedules by the same key.
+
+search_many() uses the same pool to run independent searches (e.g. the
+requests of a batch) side by side.
+
+Settings:
+  SCHEDULE_PARALLEL_WORKERS    worker processes; 0 or 1 disables (default 0)
+  SCHEDULE_PARALLEL_THRESHOLD  smallest search space, as estimated by
+                               search_space_size(), worth going parallel
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from .search import ScheduleSearch, SectionRecord, deadline_stop, entry_winners, group_by_course
+
+DEFAULT_THRESHOLD = 200_000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def parallel_workers():
+    return getattr(settings, "SCHEDULE_PARALLEL_WORKERS", 0) or 0
+
+
+def search_space_size(sections):
+    """
+    Number of ways to pick zero or one section per course.
+    """
+    size = 1
+    for group in group_by_course(range(len(sections)), sections):
+        size *= len(group) + 1
+    return size
+
+
+def should_parallelize(sections):
+    threshold = getattr(settings, "SCHEDULE_PARALLEL_THRESHOLD", DEFAULT_THRESHOLD)
+    return parallel_workers() > 1 and search_space_size(sections) >= threshold
+
+
+def get_executor():
+    """
+    One pool per process, created on first use and reused across requests.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=parallel_workers())
+        return _executor
+
+
+def _search_part(records, prefs, conflicts, branch_and_bound, fixed, k, deadline, required=None):
+    search = ScheduleSearch(records, prefs, conflicts=conflicts, branch_and_bound=branch_and_bound,
+                            fixed=fixed, stop=deadline_stop(deadline), required=required, collapse=True)
+    return search.top_entries(k), search.stats, search.complete
+
+
+def parallel_top(sections, prefs, k, conflicts=None, branch_and_bound=True, executor=None, deadline=None,
+                 required=None):
+    """
+    Same result as ScheduleSearch(...).top(k), computed in parallel.
+    Returns (winners, stats, complete) with stats summed over the parts.
+    `deadline` is a time.monotonic() value after which every part stops
+    with its best so far (complete is then False).
+    """
+    search = ScheduleSearch(sections, prefs, conflicts=conflicts, branch_and_bound=branch_and_bound,
+                            required=required, collapse=True)
+    records = search.records
+    groups = search.groups
+    if not groups:
+        return search.top(k), search.stats, True
+
+    # most constrained course: fewest ways to fill it
+    split = min(groups, key=len)
+    course_id = records[split[0]].course_id
+    parts = [records[p].pk for p in split]
+    if course_id not in search.required:
+        parts.insert(0, None)
+
+    started = time.perf_counter()
+    executor = executor or get_executor()
+    futures = [
+        executor.submit(_search_part, records, prefs, conflicts, branch_and_bound,
+                        (course_id, part), k, deadline, required)
+        for part in parts
+    ]
+
+    entries = []
+    stats = {}
+    complete = True
+    for future in futures:
+        part_entries, part_stats, part_complete = future.result()
+        entries.extend(part_entries)
+        complete = complete and part_complete
+        for key, value in part_stats.items():
+            stats[key] = stats.get(key, 0) + value
+
+    # wall time, not the sum over parts
+    stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return search.winners(heapq.nlargest(k, entries)), stats, complete
+
+
+def search_many(jobs, executor=None):
+    """
+    Run independent branch-and-bound top-k searches in the worker pool.
+    jobs: [(sections, prefs, conflicts or None, k, deadline or None, required course ids)].
+    Returns [(winners, stats, complete)] in job order.
+    """
+    executor = executor or get_executor()
+    submitted = []
+    for sections, prefs, conflicts, k, deadline, required in jobs:
+        records = [SectionRecord.from_section(s) for s in sections]
+        if conflicts is not None:
+            # only ship the part of the graph this search can see
+            ids = {r.pk for r in records}
+            conflicts = {r.pk: conflicts.get(r.pk, set()) & ids for r in records}
+        future = executor.submit(_search_part, records, prefs, conflicts, True, None, k, deadline, required)
+        submitted.append((records, future))
+
+    results = []
+    for records, future in submitted:
+        entries, stats, complete = future.result()
+        results.append((entry_winners(records, entries), stats, complete))
+    return results
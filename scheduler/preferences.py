@@ -0,0 +1,96 @@
+"""
+Hard and soft schedule preferences sent by the frontend.
+"""
+from .utils import time_to_minutes, get_section_days
+
+PREFERRED_TIME_WINDOWS = {
+    "morning":  (8 * 60, 12 * 60),   # 08:00–12:00
+    "afternoon": (12 * 60, 16 * 60), # 12:00–16:00
+    "evening":  (16 * 60, 20 * 60),  # 16:00–20:00
+}
+
+
+def earliest_start_minutes(prefs):
+    """earliest_start ("HH:MM") in minutes, or None if unset or unparseable."""
+    earliest_start_str = prefs.get("earliest_start") or None
+    if not earliest_start_str:
+        return None
+    try:
+        h, m = earliest_start_str.split(":")
+        return int(h) * 60 + int(m)
+    except ValueError:
+        return None
+
+
+def passes_hard_preferences(combo, total_credits, prefs):
+    """
+    Apply hard constraints:
+    - earliest_start: no class before this time
+    - avoid_days: no classes on these days
+    - max_classes_per_day: do not exceed this per day
+    """
+    avoid_days = prefs.get("avoid_days") or []
+    max_classes_per_day = prefs.get("max_classes_per_day") or None
+
+    earliest_start_min = earliest_start_minutes(prefs)
+
+    # 1) Check earliest_start
+    if earliest_start_min is not None:
+        for sec in combo:
+            sec_start = time_to_minutes(sec.start_time)
+            if sec_start is not None and sec_start < earliest_start_min:
+                return False
+
+    # 2) Check avoid_days
+    avoid_set = set(avoid_days)
+    if avoid_set:
+        for sec in combo:
+            if avoid_set.intersection(get_section_days(sec)):
+                return False
+
+    # 3) Check max_classes_per_day
+    if max_classes_per_day:
+        try:
+            max_per_day = int(max_classes_per_day)
+        except ValueError:
+            max_per_day = None
+        if max_per_day:
+            day_counts = {}
+            for sec in combo:
+                for d in get_section_days(sec):
+                    day_counts[d] = day_counts.get(d, 0) + 1
+            if any(count > max_per_day for count in day_counts.values()):
+                return False
+
+    # You already enforce 12–18 credits earlier in your logic.
+    return True
+
+
+def score_section(sec, prefs):
+    """
+    Soft-preference score of a single section. score_schedule is the sum of
+    these, which lets the search bound the score of a partial schedule.
+    Currently:
+    - preferred_time: morning / afternoon / evening
+      Reward sections whose mid-time lies in that window.
+    """
+    preferred_time = prefs.get("preferred_time") or None
+    if not preferred_time or preferred_time not in PREFERRED_TIME_WINDOWS:
+        return 0  # no soft preferences → neutral score
+
+    start_win, end_win = PREFERRED_TIME_WINDOWS[preferred_time]
+    start_min = time_to_minutes(sec.start_time)
+    end_min = time_to_minutes(sec.end_time)
+    if start_min is None or end_min is None:
+        return 0
+    mid = (start_min + end_min) // 2
+    if start_win <= mid <= end_win:
+        return 3  # reward sections aligned with preference
+    return 0
+
+
+def score_schedule(combo, prefs):
+    """
+    Compute a score based on soft preferences (see score_section).
+    """
+    return sum(score_section(sec, prefs) for sec in combo)
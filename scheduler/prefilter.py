@@ -0,0 +1,66 @@
+"""
+Drop sections that break per-section hard preferences before the search.
+
+earliest_start and avoid_days only look at one section at a time, so a
+section that breaks them can never be part of a valid schedule. Filtering
+those out (on the day_mask/start_min columns) shrinks every course's
+domain before any combination is built. max_classes_per_day
+depends on the whole schedule and stays in passes_hard_preferences.
+"""
+from .models import Course, CourseSection
+from .preferences import earliest_start_minutes
+from .search import MAX_SECTIONS, MIN_CREDITS, MIN_SECTIONS, SectionRecord
+from .utils import day_mask
+
+
+def section_allowed(section, prefs):
+    """
+    Whether every hard preference allows one loaded section (uses its
+    day_mask and start_min columns).
+    """
+    earliest = earliest_start_minutes(prefs or {})
+    if earliest is not None and section.start_min < earliest:
+        return False
+    return not section.day_mask & day_mask((prefs or {}).get("avoid_days") or [])
+
+
+def infeasibility(selected_ids, sections, prefs, min_credits=MIN_CREDITS,
+                  min_sections=MIN_SECTIONS, max_sections=MAX_SECTIONS):
+    """
+    Check whether the pre-filtered `sections` (CourseSections with course
+    loaded, or SectionRecords) can still make any schedule,
+    counting only courses and credits (no conflicts). Returns None if they
+    might, else {"reason": ..., "courses": [...]} naming every selected
+    course left without sections and how many each preference removed.
+    """
+    credits_left = {}
+    for s in sections:
+        credits_left[s.course_id] = s.credits if isinstance(s, SectionRecord) else s.course.credits
+    best = sorted(credits_left.values(), reverse=True)[:max_sections]
+
+    if len(credits_left) < min_sections:
+        reason = (f"Only {len(credits_left)} of the selected courses have sections that fit "
+                  f"your preferences; a schedule needs at least {min_sections}.")
+    elif sum(best) < min_credits:
+        reason = (f"The courses with sections that fit your preferences add up to at most "
+                  f"{sum(best)} credits; a schedule needs at least {min_credits}.")
+    else:
+        return None
+
+    earliest = earliest_start_minutes(prefs or {})
+    avoid = day_mask((prefs or {}).get("avoid_days") or [])
+    courses = {
+        c.pk: {"id": c.pk, "code": c.code, "sections": 0,
+               "removed_by": {"earliest_start": 0, "avoid_days": 0}}
+        for c in Course.objects.filter(id__in=selected_ids).exclude(id__in=credits_left)
+    }
+    rows = CourseSection.objects.filter(course_id__in=courses).values_list('course_id', 'start_min', 'day_mask')
+    for course_id, start_min, days in rows:
+        entry = courses[course_id]
+        entry["sections"] += 1
+        if earliest is not None and start_min < earliest:
+            entry["removed_by"]["earliest_start"] += 1
+        if days & avoid:
+            entry["removed_by"]["avoid_days"] += 1
+
+    return {"reason": reason, "courses": [courses[pk] for pk in sorted(courses)]}
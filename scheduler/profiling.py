@@ -0,0 +1,189 @@
+"""
+Opt-in per-request profiling (settings.SCHEDULE_PROFILING).
+
+When it is on, ProfilingMiddleware starts a Profile for each request and
+views mark their phases with `with phase("search"): ...`. Every database
+query is timed and counted through a connection execute wrapper (see
+signals.py). Results are exposed:
+
+- as a Server-Timing header on every profiled response
+- as a "debug" field in schedule generator responses
+- aggregated per URL route in this process, at /api/metrics/ (requests
+  that match no route share the UNMATCHED entry)
+
+With profiling off, phase() and the query wrapper only do one ContextVar
+lookup and the middleware passes requests straight through.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+_current = contextvars.ContextVar("scheduler_profile", default=None)
+
+_metrics_lock = threading.Lock()
+_metrics = {}
+
+UNMATCHED = "<unmatched>"
+
+
+def profiling_enabled():
+    return getattr(settings, "SCHEDULE_PROFILING", False)
+
+
+class Profile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}   # name -> ms
+        self.queries = 0
+        self.db_ms = 0.0
+        self.search = {}   # search counters, summed
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_phase(self, name, ms):
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def add_search_stats(self, stats):
+        for key, value in stats.items():
+            if key != "elapsed_ms":
+                self.search[key] = self.search.get(key, 0) + value
+
+    def snapshot(self):
+        """The "debug" field: timings so far, queries and search counters."""
+        return {
+            "total_ms": round(self.elapsed_ms(), 2),
+            "phases_ms": {name: round(ms, 2) for name, ms in self.phases.items()},
+            "db": {"queries": self.queries, "ms": round(self.db_ms, 2)},
+            "search": dict(self.search),
+        }
+
+    def server_timing(self, total_ms):
+        entries = [f"{name};dur={ms:.2f}" for name, ms in self.phases.items()]
+        entries.append(f'db;desc="{self.queries} queries";dur={self.db_ms:.2f}')
+        entries.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(entries)
+
+
+def current_profile():
+    """The Profile of the request being handled, or None."""
+    return _current.get()
+
+
+@contextmanager
+def phase(name):
+    """Time a block as phase `name` of the current profile, if any."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, (time.perf_counter() - started) * 1000)
+
+
+def record_search(stats):
+    """Add a finished search's stats to the current profile, if any."""
+    profile = _current.get()
+    if profile is not None:
+        profile.add_search_stats(stats)
+
+
+def count_query(execute, sql, params, many, context):
+    """Connection execute wrapper: time and count queries for the current profile."""
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_ms += (time.perf_counter() - started) * 1000
+
+
+def _route(request):
+    """The metrics key: the URL pattern that matched, not the raw path."""
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.route:
+        return UNMATCHED
+    return "/" + match.route
+
+
+def _finish(profile, request, response):
+    total_ms = profile.elapsed_ms()
+    response['Server-Timing'] = profile.server_timing(total_ms)
+
+    with _metrics_lock:
+        entry = _metrics.setdefault(_route(request), {
+            "requests": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "queries": 0, "db_ms": 0.0, "phases_ms": {}, "search": {},
+        })
+        entry["requests"] += 1
+        entry["total_ms"] += total_ms
+        entry["max_ms"] = max(entry["max_ms"], total_ms)
+        entry["queries"] += profile.queries
+        entry["db_ms"] += profile.db_ms
+        for name, ms in profile.phases.items():
+            entry["phases_ms"][name] = entry["phases_ms"].get(name, 0.0) + ms
+        for key, value in profile.search.items():
+            entry["search"][key] = entry["search"].get(key, 0) + value
+    return response
+
+
+def metrics():
+    """Per-route totals since the process started (or reset_metrics())."""
+    with _metrics_lock:
+        out = {}
+        for route, entry in _metrics.items():
+            requests = entry["requests"]
+            out[route] = {
+                "requests": requests,
+                "mean_ms": round(entry["total_ms"] / requests, 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "queries": entry["queries"],
+                "db_ms": round(entry["db_ms"], 2),
+                "phases_ms": {name: round(ms, 2) for name, ms in entry["phases_ms"].items()},
+                "search": dict(entry["search"]),
+            }
+        return out
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not profiling_enabled():
+                return await get_response(request)
+            profile = Profile()
+            token = _current.set(profile)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return _finish(profile, request, response)
+        return markcoroutinefunction(middleware)
+
+    def middleware(request):
+        if not profiling_enabled():
+            return get_response(request)
+        profile = Profile()
+        token = _current.set(profile)
+        try:
+            response = get_response(request)
+        finally:
+            _current.reset(token)
+        return _finish(profile, request, response)
+    return middleware
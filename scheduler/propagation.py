@@ -0,0 +1,101 @@
+"""
+Arc-consistency (AC-3) domain reduction for required courses.
+
+Each course's domain is its list of candidate sections. A section x of
+course X is useless if some *required* course Y has no section left that
+x does not conflict with: every schedule containing x would miss Y.
+reduce_domains() removes such sections and re-checks the courses whose
+supports shrank, until nothing changes. A required course whose domain
+empties proves there is no schedule, before any enumeration.
+
+Courses that are not required can be left out of a schedule, so they
+never remove anything from other domains; only their own sections can
+be pruned.
+"""
+from collections import deque
+
+from .models import Course
+
+
+def reduce_domains(sections, required, conflicts):
+    """
+    sections: candidate sections (anything with pk and course_id).
+    required: course ids every schedule must include.
+    conflicts: {section_id: set of conflicting ids}, e.g. from
+    conflicts.conflict_adjacency().
+
+    Returns (kept, pruned, empty):
+      kept   - `sections` minus the pruned ones, in input order
+      pruned - [(section, blocking course id)] in pruning order
+      empty  - required course ids left without sections
+    """
+    required = set(required)
+    domains = {}
+    for s in sections:
+        domains.setdefault(s.course_id, []).append(s)
+    empty = {cid for cid in required if not domains.get(cid)}
+    if empty:
+        return list(sections), [], empty
+
+    # arcs (x, y): sections of x need support in required course y
+    queue = deque((x, y) for y in sorted(required) for x in domains if x != y)
+    queued = set(queue)
+    pruned = []
+    while queue:
+        arc = queue.popleft()
+        queued.discard(arc)
+        x, y = arc
+        supports = {s.pk for s in domains[y]}
+        keep = []
+        for s in domains[x]:
+            if supports - conflicts.get(s.pk, set()):
+                keep.append(s)
+            else:
+                pruned.append((s, y))
+        if len(keep) == len(domains[x]):
+            continue
+        domains[x] = keep
+        if x in required:
+            if not keep:
+                return list(sections), pruned, {x}
+            # x supports every other course's sections
+            for z in domains:
+                if z != x and (z, x) not in queued:
+                    queue.append((z, x))
+                    queued.add((z, x))
+
+    gone = {s.pk for s, _ in pruned}
+    return [s for s in sections if s.pk not in gone], pruned, set()
+
+
+def propagate_required(sections, required, conflicts):
+    """
+    reduce_domains() for the schedule generators: returns (kept, report,
+    infeasible), where report lists the pruned sections for the response
+    and infeasible is None or {"reason": ..., "courses": [...]} like
+    prefilter.infeasibility().
+
+    `sections` are CourseSections with course loaded.
+    """
+    kept, pruned, empty = reduce_domains(sections, required, conflicts)
+    codes = {s.course_id: s.course.code for s in sections}
+    report = {"pruned": [
+        {"section": s.pk, "course": codes[s.course_id], "blocked_by": codes[y]}
+        for s, y in pruned
+    ]}
+    if not empty:
+        return kept, report, None
+
+    missing = empty - set(codes)
+    if missing:
+        codes.update(Course.objects.filter(id__in=missing).values_list('id', 'code'))
+    names = ", ".join(sorted(codes.get(cid, str(cid)) for cid in empty))
+    if pruned:
+        reason = (f"Every section of required course {names} conflicts with all sections "
+                  f"of another required course.")
+    else:
+        reason = f"Required course {names} has no sections that fit your preferences."
+    infeasible = {"reason": reason, "courses": [
+        {"id": cid, "code": codes.get(cid)} for cid in sorted(empty)
+    ]}
+    return kept, report, infeasible
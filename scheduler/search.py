@@ -0,0 +1,495 @@
+"""
+Backtracking search for valid schedules.
+
+Sections are grouped by course and a schedule takes at most one section
+per course. A branch is cut as soon as it adds a time conflict, goes over
+the credit ceiling, or can no longer reach the credit floor, so invalid
+combinations are never built in the first place.
+
+With branch_and_bound=True, top()/best() also skip subtrees whose most
+optimistic score cannot beat the worst schedule currently kept.
+
+With collapse=True, sections of a course that meet at the same times
+(and so clash with the same sections and score the same) are searched
+as one meeting-pattern class, and top() expands the classes back into
+sections at the end.
+"""
+import heapq
+import time
+from itertools import product
+
+from .utils import get_section_days, section_mask
+from .preferences import passes_hard_preferences, score_section
+
+MIN_CREDITS = 12
+MAX_CREDITS = 18
+
+# The old itertools.combinations loops only looked at 2..5 sections.
+MIN_SECTIONS = 2
+MAX_SECTIONS = 5
+
+# how many nodes to visit between calls to the `stop` callback
+STOP_CHECK_INTERVAL = 1024
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when its `stop` callback returns True."""
+
+
+class SectionRecord:
+    """
+    The fields of a CourseSection the search needs, in a compact picklable
+    form (no ORM state), so the search can run in worker processes.
+    Duck-types as a section for the preference helpers.
+    """
+    __slots__ = ('pk', 'course_id', 'credits', 'days', 'start_time', 'end_time')
+
+    def __init__(self, pk, course_id, credits, days, start_time, end_time):
+        self.pk = pk
+        self.course_id = course_id
+        self.credits = credits
+        self.days = days
+        self.start_time = start_time
+        self.end_time = end_time
+
+    @classmethod
+    def from_section(cls, section):
+        if isinstance(section, cls):
+            return section
+        return cls(
+            section.pk, section.course_id, section.course.credits,
+            tuple(get_section_days(section)), section.start_time, section.end_time,
+        )
+
+
+def deadline_stop(deadline):
+    """
+    A `stop` callback for ScheduleSearch that fires once time.monotonic()
+    passes `deadline` (None: no callback). Worker processes get the float
+    and build the callback themselves, since lambdas do not pickle.
+    """
+    if deadline is None:
+        return None
+    return lambda: time.monotonic() > deadline
+
+
+def group_by_course(positions, sections):
+    """
+    Group section positions by course id, keeping first-seen order.
+    """
+    groups = {}
+    for pos in positions:
+        groups.setdefault(sections[pos].course_id, []).append(pos)
+    return list(groups.values())
+
+
+def best_sums(values):
+    """
+    sums[n] is the total of the n largest non-negative values.
+    """
+    sums = [0]
+    for v in sorted(values, reverse=True):
+        sums.append(sums[-1] + max(v, 0))
+    return sums
+
+
+def entry_winners(records, entries):
+    """
+    Turn ScheduleSearch.top_entries() of a search over `records` into
+    (section_ids, total_credits, score).
+    """
+    return [
+        (tuple(records[-p].pk for p in neg_positions), credits, score)
+        for score, _, neg_positions, credits in entries
+    ]
+
+
+class ScheduleSearch:
+    """
+    Enumerate every schedule of `sections` that:
+    - has one section per course at most
+    - has no time conflicts
+    - totals between min_credits and max_credits
+    - passes the hard preferences in `prefs`
+
+    Sections are CourseSections with `course` loaded (select_related) for
+    the credits, or SectionRecords. Schedules come back as tuples of the
+    given sections in input order.
+
+    `conflicts` is an optional {section_id: set of conflicting ids} map,
+    usually from conflicts.conflict_adjacency(). When it is given the search
+    only looks pairs up in it; otherwise it compares meeting masks.
+
+    `fixed` = (course_id, section_id or None) forces that course to take
+    that section (or to be left out); parallel.py uses it to split the
+    search into independent parts. With collapse, the section stands for
+    its whole meeting-pattern class.
+
+    `required` is an optional set of course ids every schedule must
+    include; a required course without sections rules out every schedule.
+
+    `collapse` searches over meeting-pattern classes instead of single
+    sections. top()/best() give the same results either way; the
+    enumerating methods (iteration, ordered(), stream()) need it off.
+    A `conflicts` map must be symmetric for classes to be found from it.
+
+    `stop` is an optional callable polled every STOP_CHECK_INTERVAL nodes;
+    when it returns True the search ends early with what it found so far
+    and `complete` is False.
+
+    After a run, `stats` holds the number of nodes visited, how many
+    subtrees were pruned by conflicts, credits, required courses and the
+    score bound, and how many complete schedules the hard preferences
+    rejected.
+    """
+
+    def __init__(self, sections, prefs=None, conflicts=None, branch_and_bound=False, fixed=None,
+                 stop=None, required=None, collapse=False, min_credits=MIN_CREDITS, max_credits=MAX_CREDITS,
+                 min_sections=MIN_SECTIONS, max_sections=MAX_SECTIONS):
+        self.sections = list(sections)
+        self.records = [SectionRecord.from_section(s) for s in self.sections]
+        self.prefs = prefs or {}
+        self.branch_and_bound = branch_and_bound
+        self.min_credits = min_credits
+        self.max_credits = max_credits
+        self.min_sections = min_sections
+        self.max_sections = max_sections
+        self.stop = stop
+        self.collapse = collapse
+        self.complete = True
+        self.stats = {}
+        self._cutoff = None
+
+        # A section can be added iff footprints[pos] & blocked == 0, where
+        # blocked is the OR of blocks[p] over the sections already chosen.
+        if conflicts is None:
+            # weekly meeting masks, computed once per section
+            self.footprints = [section_mask(r) for r in self.records]
+            self.blocks = self.footprints
+        else:
+            # adjacency as bitsets over positions
+            position = {r.pk: pos for pos, r in enumerate(self.records)}
+            self.footprints = [1 << pos for pos in range(len(self.records))]
+            self.blocks = []
+            for r in self.records:
+                bits = 0
+                for other in conflicts.get(r.pk, ()):
+                    if other in position:
+                        bits |= 1 << position[other]
+                self.blocks.append(bits)
+
+        self.scores = [score_section(r, self.prefs) for r in self.records]
+
+        self.groups = group_by_course(range(len(self.records)), self.records)
+        # members[p]: the positions a searched position stands for
+        self.members = {pos: [pos] for pos in range(len(self.records))}
+        if collapse:
+            self.groups = [self._collapse(group, conflicts is not None) for group in self.groups]
+        if branch_and_bound:
+            # Try high-scoring sections first, and start with the courses
+            # that have the best section and the fewest alternatives, so a
+            # strong incumbent shows up early and the bound bites sooner.
+            for group in self.groups:
+                group.sort(key=lambda pos: -self.scores[pos])
+            self.groups.sort(key=lambda g: (-self.scores[g[0]], len(g)))
+
+        # what to try at each course, in order; None means "leave it out".
+        # Fuller schedules score higher, so bounded search skips last.
+        if branch_and_bound:
+            self.options = [g + [None] for g in self.groups]
+        else:
+            self.options = [[None] + g for g in self.groups]
+
+        if fixed is not None:
+            course_id, section_id = fixed
+            for k, group in enumerate(self.groups):
+                if self.records[group[0]].course_id != course_id:
+                    continue
+                if section_id is None:
+                    self.options[k] = [None]
+                else:
+                    self.options[k] = [p for p in group
+                                       if any(self.records[m].pk == section_id for m in self.members[p])]
+
+        self.required = set(required or ())
+        for k, group in enumerate(self.groups):
+            if self.records[group[0]].course_id in self.required:
+                self.options[k] = [p for p in self.options[k] if p is not None]
+        # a required course with no sections at all
+        self.impossible = bool(self.required - {self.records[g[0]].course_id for g in self.groups})
+        # need[k]: required courses among k..end, which all still need a slot
+        self.need = [0] * (len(self.groups) + 1)
+        for k in range(len(self.groups) - 1, -1, -1):
+            self.need[k] = self.need[k + 1] + (self.records[self.groups[k][0]].course_id in self.required)
+
+        self.group_credits = [self.records[g[0]].credits for g in self.groups]
+        group_scores = [max(self.scores[p] for p in g) for g in self.groups]
+
+        # reach[k][n] / gain[k][n]: most credits / score obtainable from
+        # n of the courses k..end
+        self.reach = [best_sums(self.group_credits[k:]) for k in range(len(self.groups) + 1)]
+        self.gain = [best_sums(group_scores[k:]) for k in range(len(self.groups) + 1)]
+
+    def _collapse(self, group, by_position):
+        """
+        Keep the first section of each meeting-pattern class in `group`
+        and record the rest under it in self.members.
+        """
+        course_bits = 0
+        if by_position:
+            for pos in group:
+                course_bits |= self.footprints[pos]
+        classes = {}
+        for pos in group:
+            r = self.records[pos]
+            # conflicts outside the course; masks already follow the times
+            outside = self.blocks[pos] & ~course_bits if by_position else 0
+            key = (r.days, r.start_time, r.end_time, outside)
+            if key in classes:
+                rep = classes[key]
+                self.members[rep].append(pos)
+                del self.members[pos]
+            else:
+                classes[key] = pos
+        return list(classes.values())
+
+    def _multiplicity(self, positions):
+        """How many section-level schedules a searched schedule stands for."""
+        n = 1
+        for p in positions:
+            n *= len(self.members[p])
+        return n
+
+    def _expand(self, positions, credits, score):
+        """Heap entries of every section-level schedule behind `positions`."""
+        for picked in product(*(self.members[p] for p in positions)):
+            picked = sorted(picked)
+            yield score, -len(picked), tuple(-p for p in picked), credits
+
+    @staticmethod
+    def _best_of(table, k, slots):
+        sums = table[k]
+        return sums[min(slots, len(sums) - 1)]
+
+    def _extend(self, k, chosen, credits, blocked, score, floor=None):
+        """
+        Depth-first search from course k. `floor` is the rest of a resume
+        path (option ranks per course); while it is set, only options at or
+        after it are tried and the path itself is not yielded again.
+        """
+        stats = self.stats
+        stats["nodes"] += 1
+        if self.stop is not None and stats["nodes"] % STOP_CHECK_INTERVAL == 0 and self.stop():
+            raise SearchStopped()
+        slots = self.max_sections - len(chosen)
+
+        # no room left for the required courses still ahead
+        if self.need[k] > slots:
+            stats["pruned_required"] += 1
+            return
+
+        # can no longer reach the credit floor
+        if credits + self._best_of(self.reach, k, slots) < self.min_credits:
+            stats["pruned_credits"] += 1
+            return
+
+        # cannot beat the worst schedule we are keeping
+        cutoff = self._cutoff
+        if cutoff is not None and score + self._best_of(self.gain, k, slots) < cutoff:
+            stats["pruned_bound"] += 1
+            return
+
+        if k == len(self.groups) or slots == 0:
+            if len(chosen) >= self.min_sections and floor is None:
+                yield tuple(sorted(chosen)), credits, score
+            return
+
+        total = credits + self.group_credits[k]
+        over_credits = total > self.max_credits
+        if over_credits:
+            stats["pruned_credits"] += 1
+
+        for rank, pos in enumerate(self.options[k]):
+            sub_floor = None
+            if floor is not None:
+                if rank < floor[0]:
+                    continue
+                if rank == floor[0]:
+                    sub_floor = floor[1:]
+
+            if pos is None:
+                # leave this course out
+                yield from self._extend(k + 1, chosen, credits, blocked, score, sub_floor)
+                continue
+
+            # take one of its sections
+            if over_credits:
+                continue
+            if self.footprints[pos] & blocked:
+                stats["pruned_conflict"] += 1
+                continue
+            chosen.append(pos)
+            yield from self._extend(k + 1, chosen, total, blocked | self.blocks[pos],
+                                    score + self.scores[pos], sub_floor)
+            chosen.pop()
+
+    def _positions(self, floor=None):
+        """
+        Yield (positions, total_credits, score) for every valid schedule.
+        """
+        self.stats = {"nodes": 0, "pruned_conflict": 0, "pruned_credits": 0, "pruned_required": 0,
+                      "pruned_bound": 0, "pruned_prefs": 0, "schedules": 0}
+        self._cutoff = None
+        self.complete = True
+        started = time.perf_counter()
+        if self.impossible:
+            self.stats["elapsed_ms"] = 0.0
+            return
+        try:
+            for positions, credits, score in self._extend(0, [], 0, 0, 0, floor):
+                combo = tuple(self.records[p] for p in positions)
+                if passes_hard_preferences(combo, credits, self.prefs):
+                    self.stats["schedules"] += self._multiplicity(positions)
+                    yield positions, credits, score
+                else:
+                    self.stats["pruned_prefs"] += 1
+        except SearchStopped:
+            self.complete = False
+        finally:
+            self.stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def __iter__(self):
+        """
+        Yield (combo, total_credits) in search order.
+        """
+        self._check_enumerable()
+        for positions, credits, _ in self._positions():
+            yield tuple(self.sections[p] for p in positions), credits
+
+    def stream(self, after=None):
+        """
+        Lazily yield (section_ids, total_credits, score) in search order.
+
+        `after` is the section_ids of a schedule yielded earlier; the stream
+        then resumes right after it. Raises ValueError if those sections are
+        not part of this search. Not available with branch_and_bound.
+        """
+        if self.branch_and_bound:
+            raise ValueError("stream() needs the exhaustive search order.")
+        self._check_enumerable()
+        floor = self._resume_path(after) if after else None
+        for positions, credits, score in self._positions(floor):
+            yield tuple(self.records[p].pk for p in positions), credits, score
+
+    def _resume_path(self, section_ids):
+        position = {r.pk: pos for pos, r in enumerate(self.records)}
+        try:
+            picked = {position[i] for i in section_ids}
+        except KeyError:
+            raise ValueError("Cursor refers to unknown sections.")
+
+        path = []
+        for options in self.options:
+            taken = [rank for rank, pos in enumerate(options) if pos in picked]
+            if len(taken) > 1:
+                raise ValueError("Cursor takes two sections of one course.")
+            path.append(taken[0] if taken else options.index(None))
+        return path
+
+    def _check_enumerable(self):
+        if self.collapse:
+            raise ValueError("Enumerating schedules needs collapse=False.")
+
+    def ordered(self):
+        """
+        All valid schedules in the order the old combinations loop produced
+        them: by size, then by position in the input.
+        """
+        self._check_enumerable()
+        found = sorted(self._positions(), key=lambda item: (len(item[0]), item[0]))
+        return [(tuple(self.sections[p] for p in positions), credits)
+                for positions, credits, _ in found]
+
+    def top_entries(self, k):
+        """
+        Heap entries (score, -size, negated positions, total_credits) of the
+        k best schedules, best first. Larger entries are better schedules,
+        so entries from searches over the same input can be merged.
+        """
+        if k < 1:
+            return []
+        if self.collapse:
+            return self._top_collapsed_entries(k)
+        heap = []
+        for positions, credits, score in self._positions():
+            # the heap root is the worst schedule kept
+            entry = (score, -len(positions), tuple(-p for p in positions), credits)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            if self.branch_and_bound and len(heap) == k:
+                # equal bounds are still explored: they may win the tie-break
+                self._cutoff = heap[0][0]
+
+        heap.sort(reverse=True)
+        return heap
+
+    def _top_collapsed_entries(self, k):
+        """
+        top_entries() over meeting-pattern classes. A class-level schedule
+        stands for several section-level ones with the same score and size,
+        which only the section positions tell apart: the heap keeps the k
+        best section-level entries, and a class-level schedule is only
+        expanded if its best section-level entry would make the heap.
+        """
+        heap = []
+        for positions, credits, score in self._positions():
+            if len(heap) == k:
+                # members are in position order, so the first of each is the best pick
+                best = (score, -len(positions), tuple(-p for p in sorted(
+                    self.members[p][0] for p in positions)), credits)
+                if best <= heap[0]:
+                    continue
+            for entry in heapq.nlargest(k, self._expand(positions, credits, score)):
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+                else:
+                    break
+            if self.branch_and_bound and len(heap) == k:
+                # equal bounds are still explored: they may win the tie-break
+                self._cutoff = heap[0][0]
+
+        heap.sort(reverse=True)
+        return heap
+
+    def winners(self, entries):
+        """
+        Turn top_entries() into (section_ids, total_credits, score).
+        """
+        return entry_winners(self.records, entries)
+
+    def top(self, k):
+        """
+        Return the k best schedules as (section_ids, total_credits, score),
+        best first. Only a heap of k id tuples is kept while searching.
+        Ties go to the schedule the combinations loop saw first: smaller
+        schedules, then earlier positions in the input.
+        """
+        return self.winners(self.top_entries(k))
+
+    def best(self):
+        """
+        Return (combo, total_credits, score) for the highest scoring schedule,
+        or None.
+        """
+        winners = self.top(1)
+        if not winners:
+            return None
+        ids, credits, score = winners[0]
+        by_id = {s.pk: s for s in self.sections}
+        return tuple(by_id[i] for i in ids), credits, score
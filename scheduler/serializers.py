@@ -1,9 +1,8 @@
 from rest_framework import serializers
 from .models import Course, CourseSection
+from .utils import DAY_CODES, time_to_minutes
 import ast
 
-DAY_CODES = ['M', 'T', 'W', 'Th', 'F']
-
 class CourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
@@ -40,20 +39,19 @@ class CourseSectionWriteSerializer(serializers.ModelSerializer):
         if start_time >= end_time:
             raise serializers.ValidationError("Start time must be before end time.")
 
-        existing_sections = CourseSection.objects.filter(course=course)
-
-        for existing in existing_sections:
-            existing_days = (
-                existing.days if isinstance(existing.days, list)
-                else [d.strip() for d in existing.days.split(',') if d.strip()]
+        # overlap test runs in SQL on the day_mask/start_min/end_min columns
+        existing = (
+            CourseSection.objects
+            .filter(course=course)
+            .overlapping(days, time_to_minutes(start_time), time_to_minutes(end_time))
+            .order_by('id')
+            .first()
+        )
+        if existing is not None:
+            raise serializers.ValidationError(
+                f"Time conflict with section {existing.section_number} ({existing.start_time}-{existing.end_time} on {existing.days})."
             )
 
-            if any(day in existing_days for day in days):
-                if not (end_time <= existing.start_time or start_time >= existing.end_time):
-                    raise serializers.ValidationError(
-                        f"Time conflict with section {existing.section_number} ({existing.start_time}-{existing.end_time} on {existing.days})."
-                    )
-
         return attrs
 
     def validate_days(self, value):
@@ -79,4 +77,38 @@ class CourseSectionReadSerializer(serializers.ModelSerializer):
     course = CourseSerializer(read_only=True)
     class Meta:
         model = CourseSection
-        fields = ['id', 'course', 'section_number', 'instructor', 'days', 'start_time', 'end_time']
\ No newline at end of file
+        fields = ['id', 'course', 'section_number', 'instructor', 'days', 'start_time', 'end_time']
+
+
+# Fast read path: the same JSON as CourseSectionReadSerializer, built by hand
+# from .values() rows instead of model instances and nested serializers.
+SECTION_FIELDS = ['id', 'course', 'section_number', 'instructor', 'days', 'start_time', 'end_time']
+SECTION_COLUMNS = ['id', 'course_id', 'course__code', 'course__title', 'course__credits',
+                   'section_number', 'instructor', 'days', 'start_time', 'end_time']
+
+
+def section_dicts(rows, fields=None):
+    """
+    rows: dicts from CourseSection.objects.values(*SECTION_COLUMNS).
+    fields: optional subset of SECTION_FIELDS to keep, in that order.
+    """
+    out = []
+    for r in rows:
+        data = {
+            'id': r['id'],
+            'course': {
+                'id': r['course_id'],
+                'code': r['course__code'],
+                'title': r['course__title'],
+                'credits': r['course__credits'],
+            },
+            'section_number': r['section_number'],
+            'instructor': r['instructor'],
+            'days': list(r['days']),
+            'start_time': r['start_time'].isoformat(),
+            'end_time': r['end_time'].isoformat(),
+        }
+        if fields is not None:
+            data = {f: data[f] for f in fields}
+        out.append(data)
+    return out
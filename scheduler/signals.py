@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Course, CourseSection
+from .conflicts import register_patterns, section_pattern_key
+from .caching import bump_catalog_version
+from .profiling import count_query
+
+
+@receiver(post_save, sender=CourseSection)
+def update_section_conflicts(sender, instance, **kwargs):
+    # raw (loaddata) saves too: fixtures rarely include the pattern graph.
+    # patterns left without sections are harmless and kept for reuse
+    register_patterns([section_pattern_key(instance)])
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CourseSection)
+@receiver(post_delete, sender=CourseSection)
+def catalog_changed(sender, **kwargs):
+    # after the commit, so nobody caches pre-commit rows under the new version
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    # a no-op unless a profiled request is running; see profiling.py
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
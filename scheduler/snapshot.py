@@ -0,0 +1,164 @@
+"""
+Per-process, read-only catalog snapshot for the schedule hot path.
+
+Schedule requests only need a few columns of each section, so instead of
+querying and building model instances per request, every worker process
+keeps one CatalogSnapshot: compact __slots__ records (ids, credits,
+days/times, day_mask/start_min, meeting pattern), each with the
+section's serialized JSON, and the overlaps between its meeting patterns
+from the persisted graph (conflicts.py). catalog_snapshot() loads it the
+first time and again whenever the catalog version (see caching.py)
+has moved on; the new snapshot is built aside and swapped in whole, so
+readers never see a half-built one. Between catalog writes, the generators, the
+count endpoint, solver sessions and the conflict report make no queries
+for sections.
+
+Records duck-type as CourseSections with `course` loaded (including
+`course.code`), so the search, prefilter, propagation and conflict
+report helpers take them as they are.
+"""
+import threading
+
+from .caching import get_catalog_version
+from .conflicts import pattern_key, register_patterns
+from .models import CourseSection, MeetingPattern
+from .prefilter import section_allowed
+from .search import SectionRecord
+from .serializers import SECTION_COLUMNS, section_dicts
+from .utils import day_mask, parse_days, time_to_minutes
+
+
+class CourseInfo:
+    """The Course columns schedule responses use."""
+    __slots__ = ('id', 'pk', 'code', 'title', 'credits')
+
+    def __init__(self, id, code, title, credits):
+        self.id = self.pk = id
+        self.code = code
+        self.title = title
+        self.credits = credits
+
+
+class SnapshotSection(SectionRecord):
+    """
+    A SectionRecord with the columns the prefilter and conflict report
+    read, and its response JSON (`payload`, shared: do not modify).
+    """
+    __slots__ = ('course', 'section_number', 'instructor', 'start_min', 'day_mask', 'pattern', 'payload')
+
+    def __init__(self, pk, course, section_number, instructor, days, start_time, end_time, pattern,
+                 payload):
+        super().__init__(pk, course.id, course.credits, days, start_time, end_time)
+        self.course = course
+        self.section_number = section_number
+        self.instructor = instructor
+        self.start_min = time_to_minutes(start_time) or 0
+        self.day_mask = day_mask(days)
+        self.pattern = pattern
+        self.payload = payload
+
+    def __reduce__(self):
+        # worker processes only search: send them the plain record
+        return SectionRecord, (self.pk, self.course_id, self.credits, self.days,
+                               self.start_time, self.end_time)
+
+
+class CatalogSnapshot:
+    """
+    Every section of the catalog at `version`. Sections sharing days and
+    times share a pattern index; `pairs` are the overlapping (key, key)
+    pairs of the MeetingPattern graph.
+    """
+
+    def __init__(self, version, rows, pairs=()):
+        self.version = version
+        self.courses = {}      # course id -> CourseInfo
+        self.sections = {}     # section id -> SnapshotSection, in id order
+        self.by_course = {}    # course id -> [SnapshotSection], in id order
+        self.keys = []         # pattern index -> conflicts.pattern_key()
+        patterns = {}          # pattern key -> pattern index
+
+        for row, payload in zip(rows, section_dicts(rows)):
+            course = self.courses.get(row['course_id'])
+            if course is None:
+                course = self.courses[row['course_id']] = CourseInfo(
+                    row['course_id'], row['course__code'], row['course__title'], row['course__credits'])
+            days = tuple(parse_days(row['days']))
+            key = pattern_key(days, time_to_minutes(row['start_time']), time_to_minutes(row['end_time']))
+            if key not in patterns:
+                patterns[key] = len(self.keys)
+                self.keys.append(key)
+            section = SnapshotSection(row['id'], course, row['section_number'], row['instructor'],
+                                      days, row['start_time'], row['end_time'], patterns[key], payload)
+            self.sections[section.pk] = section
+            self.by_course.setdefault(course.id, []).append(section)
+
+        overlaps = [set() for _ in self.keys]   # pattern index -> overlapping patterns
+        for a, b in pairs:
+            if a in patterns and b in patterns:
+                overlaps[patterns[a]].add(patterns[b])
+                overlaps[patterns[b]].add(patterns[a])
+        self._overlaps = [frozenset(o) for o in overlaps]
+
+    @classmethod
+    def load(cls, version):
+        rows = list(CourseSection.objects.order_by('id').values(*SECTION_COLUMNS))
+        keys = {pattern_key(parse_days(r['days']), time_to_minutes(r['start_time']),
+                            time_to_minutes(r['end_time'])) for r in rows}
+        # writes that skip save() may have left patterns unregistered
+        register_patterns(keys)
+        pairs = MeetingPattern.conflicts.through.objects.values_list(
+            'from_meetingpattern__key', 'to_meetingpattern__key')
+        return cls(version, rows, pairs)
+
+    def course_sections(self, course_ids, prefs=None):
+        """
+        Sections of `course_ids` that the per-section hard preferences in
+        `prefs` allow (see prefilter.section_allowed()), in id order.
+        """
+        found = []
+        for course_id in {int(i) for i in course_ids}:
+            found.extend(s for s in self.by_course.get(course_id, ()) if section_allowed(s, prefs))
+        found.sort(key=lambda s: s.pk)
+        return found
+
+    def overlapping(self, pattern):
+        """Indexes of the patterns that overlap `pattern` (itself included)."""
+        return self._overlaps[pattern]
+
+    def conflicts(self, sections):
+        """conflicts.conflict_adjacency() for snapshot sections, without queries."""
+        by_pattern = {}
+        for s in sections:
+            by_pattern.setdefault(s.pattern, []).append(s.pk)
+        adjacency = {}
+        for pattern, ids in by_pattern.items():
+            clashing = set()
+            for other in self.overlapping(pattern) & by_pattern.keys():
+                clashing.update(by_pattern[other])
+            for pk in ids:
+                # a section never conflicts with itself
+                adjacency[pk] = clashing - {pk}
+        return adjacency
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def catalog_snapshot():
+    """
+    This process's snapshot of the current catalog version, (re)loaded if
+    the version has changed since it was built.
+    """
+    global _snapshot
+    # read the version before the rows: a write in between only makes the
+    # snapshot newer than its label, and the next bump reloads it anyway
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = CatalogSnapshot.load(version)
+        return _snapshot
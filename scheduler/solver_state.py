@@ -0,0 +1,224 @@
+"""
+Session-scoped solver state for incremental re-solves.
+
+Users tend to regenerate after toggling one course or one preference. A
+SolverState keeps, per session token:
+
+- the sections of every course the session has used (snapshot records,
+  with meeting masks), so each is looked at once
+- every feasible partial schedule of the selected courses, as a tuple of
+  section ids and its credits: at most
+  MAX_SECTIONS sections, pairwise conflict-free, at most MAX_CREDITS,
+  and allowed by the per-section hard preferences (earliest_start,
+  avoid_days)
+
+From there a tweak is cheap:
+- removing a course drops the partials that use it
+- adding a course extends every partial by each of its sections
+- tightening earliest_start/avoid_days drops partials with sections the
+  new preferences rule out
+- soft preferences, max_classes_per_day and required courses are
+  applied when picking the answer, so changing them costs no re-solve
+  at all
+
+Loosening a hard preference rebuilds the partials from the cached
+sections. The answer is the same one /api/generate-schedules/ gives,
+including tie-breaks.
+
+Memory is bounded two ways. A state whose partials would exceed
+SCHEDULE_SESSION_MAX_PARTIALS drops them and answers with a regular
+search over its cached sections. The store keeps at most
+SCHEDULE_SESSION_MAX_STATES states, evicting the least recently used,
+and expires states unused for SCHEDULE_SESSION_TTL seconds. States live
+in this process only; an unknown token just starts a new state.
+"""
+import heapq
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .caching import get_catalog_version
+from .preferences import earliest_start_minutes, passes_hard_preferences, score_section
+from .search import MAX_CREDITS, MAX_SECTIONS, MIN_CREDITS, MIN_SECTIONS, ScheduleSearch
+from .snapshot import catalog_snapshot
+from .utils import day_mask, section_mask, time_to_minutes
+
+
+def hard_key(prefs):
+    """The per-section hard preferences as (earliest start minute or None, avoided day bits)."""
+    return earliest_start_minutes(prefs), day_mask(prefs.get("avoid_days") or [])
+
+
+def is_tighter(new, old):
+    """True if every section `new` allows is also allowed by `old`."""
+    (new_start, new_days), (old_start, old_days) = new, old
+    if old_start is not None and (new_start is None or new_start < old_start):
+        return False
+    return old_days & ~new_days == 0
+
+
+class SolverState:
+    def __init__(self, version):
+        self.version = version
+        self.records = {}     # course_id -> [SectionRecord], by id
+        self.masks = {}       # section id -> meeting mask
+        self.clashes = {}     # section id -> ids of loaded sections it overlaps
+        self.meta = {}        # section id -> (start_min, day_mask)
+        self.courses = set()  # courses the partials cover
+        self.hard = (None, 0)
+        # (section ids ascending, credits); None once too many
+        self.partials = [((), 0)]
+        self.overflow = None  # (courses, hard key) that were too many
+
+    def load(self, course_ids):
+        """Take the sections of courses not seen before from the catalog snapshot."""
+        missing = set(course_ids) - set(self.records)
+        if not missing:
+            return
+        for cid in missing:
+            self.records[cid] = []
+        for record in catalog_snapshot().course_sections(missing):
+            mask = section_mask(record)
+            self.clashes[record.pk] = set()
+            for other, other_mask in self.masks.items():
+                if mask & other_mask:
+                    self.clashes[record.pk].add(other)
+                    self.clashes[other].add(record.pk)
+            self.records[record.course_id].append(record)
+            self.masks[record.pk] = mask
+            self.meta[record.pk] = (time_to_minutes(record.start_time), day_mask(record.days))
+
+    def allowed(self, pk, key=None):
+        earliest, avoid = key or self.hard
+        start, days = self.meta[pk]
+        return (earliest is None or start >= earliest) and not days & avoid
+
+    def domain(self, course_id):
+        return [r for r in self.records[course_id] if self.allowed(r.pk)]
+
+    def add_course(self, course_id, limit):
+        grown = []
+        for record in self.domain(course_id):
+            clashes, credits = self.clashes[record.pk], record.credits
+            for ids, total in self.partials:
+                if len(ids) < MAX_SECTIONS and total + credits <= MAX_CREDITS and clashes.isdisjoint(ids):
+                    grown.append((tuple(sorted(ids + (record.pk,))), total + credits))
+            if len(self.partials) + len(grown) > limit:
+                self.partials = None
+                return
+        self.partials.extend(grown)
+        self.courses.add(course_id)
+
+    def update(self, course_ids, prefs, limit):
+        """
+        Bring the partials to `course_ids` under `prefs`. Returns how:
+        "incremental", "rebuild" or "search" (partials over the limit).
+        """
+        self.load(course_ids)
+        key = hard_key(prefs)
+        if self.overflow and self.overflow[0] <= set(course_ids) and self.overflow[1] == key:
+            # a superset of what was already too many; domain() follows
+            # the new hard preferences all the same
+            self.partials = None
+            self.hard = key
+            return "search"
+        mode = "incremental"
+        if self.partials is None or not is_tighter(key, self.hard):
+            # start over from the cached sections
+            mode = "rebuild"
+            self.partials, self.courses = [((), 0)], set()
+        elif key != self.hard:
+            self.partials = [p for p in self.partials if all(self.allowed(pk, key) for pk in p[0])]
+        self.hard = key
+
+        removed = self.courses - set(course_ids)
+        if removed:
+            gone = {r.pk for cid in removed for r in self.records[cid]}
+            self.partials = [p for p in self.partials if gone.isdisjoint(p[0])]
+            self.courses -= removed
+        for cid in sorted(set(course_ids) - self.courses):
+            self.add_course(cid, limit)
+            if self.partials is None:
+                self.overflow = (set(self.courses) | {cid}, key)
+                self.courses = set()
+                return "search"
+        return mode
+
+    def sections(self, course_ids):
+        """Allowed SectionRecords of `course_ids`, in id order."""
+        return sorted((r for cid in set(course_ids) for r in self.domain(cid)), key=lambda r: r.pk)
+
+    def top(self, course_ids, prefs, k, required=(), stop=None):
+        """
+        (winners, stats, complete) like ScheduleSearch(...).top(k) over
+        sections(). `stop` only applies to the fallback search; picking
+        from the partials always completes.
+        """
+        by_id = {r.pk: r for r in self.sections(course_ids)}
+        if self.partials is None:
+            search = ScheduleSearch(list(by_id.values()), prefs, branch_and_bound=True, collapse=True,
+                                    required=required, stop=stop)
+            return search.top(k), search.stats, search.complete
+
+        required = set(required)
+        scores = {}
+        entries = []
+        for ids, credits in self.partials:
+            if len(ids) < MIN_SECTIONS or credits < MIN_CREDITS:
+                continue
+            combo = [by_id[pk] for pk in ids]
+            if required and not required <= {r.course_id for r in combo}:
+                continue
+            if not passes_hard_preferences(combo, credits, prefs):
+                continue
+            score = 0
+            for r in combo:
+                if r.pk not in scores:
+                    scores[r.pk] = score_section(r, prefs)
+                score += scores[r.pk]
+            # same ranking as ScheduleSearch.top_entries (ids follow positions)
+            entries.append((score, -len(ids), tuple(-pk for pk in ids), credits))
+        best = heapq.nlargest(k, entries)
+        winners = [(tuple(-pk for pk in neg), credits, score) for score, _, neg, credits in best]
+        return winners, {"partials": len(self.partials), "schedules": len(entries)}, True
+
+
+class SolverStateStore:
+    """A small LRU of SolverStates keyed by token, with a TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = OrderedDict()  # token -> (last used, state)
+
+    def take(self, token):
+        """
+        Remove and return the state for token (None if unknown, expired or
+        stale), so concurrent requests never share one.
+        """
+        ttl = getattr(settings, "SCHEDULE_SESSION_TTL", 1800)
+        with self._lock:
+            used, state = self._states.pop(token, (None, None))
+        if state is None or time.monotonic() - used > ttl or state.version != get_catalog_version():
+            return None
+        return state
+
+    def put(self, state, token=None):
+        """Store state under token (a new one if None) and return the token."""
+        token = token or secrets.token_urlsafe(16)
+        limit = getattr(settings, "SCHEDULE_SESSION_MAX_STATES", 128)
+        with self._lock:
+            self._states[token] = (time.monotonic(), state)
+            self._states.move_to_end(token)
+            while len(self._states) > limit:
+                self._states.popitem(last=False)
+        return token
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+
+store = SolverStateStore()
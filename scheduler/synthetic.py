@@ -0,0 +1,71 @@
+"""
+Reproducible synthetic catalogs for benchmarks and load tests.
+
+synthetic_rows() returns rows in the catalog_import format, so they go
+through the same validation and bulk insert as a real import.
+
+Each course gets `sections_per_course` sections, each on a distinct
+(day family, slot) pair: the families are M/W/F patterns and T/Th, and
+slots are 90 minutes apart from 08:00. A course's sections therefore
+never overlap, which import_catalog requires. `density` (0..1) squeezes
+the slots into the start of the day: at 0 sections spread over all
+SLOTS_PER_DAY slots, at 1 they share as few slots as possible, so
+sections of different courses conflict more often.
+"""
+import math
+import random
+
+DAY_START = 8 * 60
+SLOT_MINUTES = 90
+SLOTS_PER_DAY = 9  # 08:00 .. 20:00 starts
+
+# (days, length in minutes); every pattern fits in one slot
+FAMILIES = [
+    [("M,W,F", 50), ("M,W", 75)],
+    [("T,Th", 75)],
+]
+
+
+def slots_for(sections_per_course, density):
+    """Number of slots in use for a density, enough to fit every section of a course."""
+    if not 0 <= density <= 1:
+        raise ValueError("density must be between 0 and 1.")
+    needed = math.ceil(sections_per_course / len(FAMILIES))
+    if needed > SLOTS_PER_DAY:
+        raise ValueError(f"At most {SLOTS_PER_DAY * len(FAMILIES)} sections per course fit without overlaps.")
+    spread = round(SLOTS_PER_DAY - density * (SLOTS_PER_DAY - 1))
+    return max(needed, spread)
+
+
+def hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def synthetic_rows(courses, sections_per_course, density=0.5, credits=(3, 4), seed=0, prefix="SYN"):
+    """
+    Rows for `courses` courses with `sections_per_course` sections each.
+    The same arguments always give the same rows.
+    """
+    rng = random.Random(seed)
+    slots = slots_for(sections_per_course, density)
+    places = [(family, slot) for family in range(len(FAMILIES)) for slot in range(slots)]
+    width = len(str(max(courses - 1, 0)))
+
+    rows = []
+    for c in range(courses):
+        code = f"{prefix}-{c:0{width}d}"
+        course_credits = rng.choice(credits)
+        for s, (family, slot) in enumerate(rng.sample(places, sections_per_course)):
+            days, length = rng.choice(FAMILIES[family])
+            start = DAY_START + slot * SLOT_MINUTES + rng.choice([0, 5, 10])
+            rows.append({
+                "course_code": code,
+                "course_title": f"Synthetic course {c}",
+                "credits": course_credits,
+                "section_number": f"{s + 1:02d}",
+                "instructor": f"Instructor {rng.randrange(max(courses // 2, 1))}",
+                "days": days,
+                "start_time": hhmm(start),
+                "end_time": hhmm(start + length),
+            })
+    return rows
@@ -1,7 +1,33 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core import serializers
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
 from datetime import time
-from .models import Course, CourseSection
-from .utils import has_conflict
+from .models import CatalogVersion, Course, CourseSection, Enrollment, MeetingPattern, Student
+from .serializers import CourseSectionReadSerializer
+from .conflicts import conflict_adjacency
+from .caching import CATALOG_VERSION_KEY, bump_catalog_version, cache_stats, get_catalog_version
+from .catalog_import import import_catalog, read_rows
+from .conflict_report import find_conflicts
+from .counting import ScheduleCounter
+from .enrollment_audit import audit_term
+from .parallel import parallel_top, should_parallelize
+from .profiling import UNMATCHED, reset_metrics
+from .propagation import reduce_domains
+from .utils import has_conflict, meeting_mask, section_mask
+from .preferences import passes_hard_preferences, score_schedule
+from .search import ScheduleSearch
+from .snapshot import catalog_snapshot
+from .solver_state import store as solver_states
+from .synthetic import synthetic_rows
 from itertools import combinations
 
 class ConflictDetectionTests(TestCase):
@@ -44,6 +70,29 @@ class ConflictDetectionTests(TestCase):
         self.assertEqual(has_conflict(self.section1, self.section3),
                          has_conflict(self.section3, self.section1))
 
+    def test_back_to_back_is_not_a_conflict(self):
+        a = meeting_mask(["M"], 9 * 60, 10 * 60)
+        b = meeting_mask(["M"], 10 * 60, 11 * 60)
+        self.assertEqual(a & b, 0)
+        self.assertNotEqual(a & meeting_mask(["M", "W"], 9 * 60 + 59, 11 * 60), 0)
+
+    def test_meeting_columns_filter_in_sql(self):
+        s1 = self.section1
+        self.assertEqual((s1.day_mask, s1.start_min, s1.end_min), (0b101, 540, 600))
+        sections = CourseSection.objects.all()
+        self.assertEqual(set(sections.meeting_on(["Th"])), {self.section2})
+        self.assertEqual(set(sections.avoiding(["M"])), {self.section2})
+        self.assertEqual(set(sections.overlapping(["M"], 570, 580)), {self.section1, self.section3})
+
+        self.section2.days = ["F"]
+        self.section2.save(update_fields=["days"])
+        self.section2.refresh_from_db()
+        self.assertEqual(self.section2.day_mask, 0b10000)
+
+    def test_mask_of_schedule_is_or_of_sections(self):
+        occupied = section_mask(self.section1) | section_mask(self.section2)
+        self.assertTrue(section_mask(self.section3) & occupied)
+
 
 class ScheduleCreditTests(TestCase):
     def test_credit_range_filter(self):
@@ -52,3 +101,928 @@ class ScheduleCreditTests(TestCase):
         c3 = Course.objects.create(code="CS3", title="C", credits=5)
         total = sum(c.credits for c in [c1, c2, c3])
         self.assertTrue(12 <= total <= 18)
+
+
+def brute_force_schedules(sections, prefs):
+    """The original combinations loop, kept as the reference for the search."""
+    found = []
+    for r in range(2, min(6, len(sections) + 1)):
+        for combo in combinations(sections, r):
+            if len({s.course_id for s in combo}) != len(combo):
+                continue
+            if any(has_conflict(a, b) for i, a in enumerate(combo) for b in combo[i + 1:]):
+                continue
+            total_credits = sum(s.course.credits for s in combo)
+            if not (12 <= total_credits <= 18):
+                continue
+            if not passes_hard_preferences(combo, total_credits, prefs):
+                continue
+            found.append((combo, total_credits))
+    return found
+
+
+def create_sample_catalog():
+    """
+    Six courses of three sections each, rotating through six meeting
+    slots. Returns the sections (course loaded) in id order.
+    """
+    slots = [
+        (["M", "W"], time(9, 0), time(10, 15)),
+        (["M", "W"], time(10, 0), time(11, 15)),
+        (["T", "Th"], time(9, 0), time(10, 15)),
+        (["T", "Th"], time(13, 0), time(14, 15)),
+        (["M", "W", "F"], time(14, 0), time(14, 50)),
+        (["F"], time(8, 0), time(10, 50)),
+    ]
+    credits = [3, 4, 4, 3, 5, 3]
+    for i, c in enumerate(credits):
+        course = Course.objects.create(code=f"C{i}", title=f"Course {i}", credits=c)
+        for j in range(3):
+            days, start, end = slots[(i + 2 * j) % len(slots)]
+            CourseSection.objects.create(
+                course=course, section_number=f"0{j}",
+                days=days, start_time=start, end_time=end,
+            )
+    return list(CourseSection.objects.select_related('course').order_by('id'))
+
+
+class SampleCatalogTestCase(TestCase):
+    def setUp(self):
+        # the cached catalog version would outlive the previous test's rows
+        cache.clear()
+        self.sections = create_sample_catalog()
+
+
+class ScheduleSearchTests(SampleCatalogTestCase):
+    def test_matches_combinations(self):
+        for prefs in [{}, {"avoid_days": ["F"]}, {"earliest_start": "10:00"}]:
+            expected = brute_force_schedules(self.sections, prefs)
+            self.assertEqual(ScheduleSearch(self.sections, prefs).ordered(), expected)
+
+    def test_best_matches_first_max(self):
+        prefs = {"preferred_time": "afternoon"}
+        expected = max(
+            brute_force_schedules(self.sections, prefs),
+            key=lambda item: score_schedule(item[0], prefs),
+        )
+        combo, credits, score = ScheduleSearch(self.sections, prefs).best()
+        self.assertEqual((combo, credits), expected)
+        self.assertEqual(score, score_schedule(expected[0], prefs))
+
+    def test_adjacency_matches_masks(self):
+        prefs = {"preferred_time": "morning"}
+        conflicts = conflict_adjacency(self.sections)
+        with_index = ScheduleSearch(self.sections, prefs, conflicts=conflicts)
+        self.assertEqual(with_index.ordered(), ScheduleSearch(self.sections, prefs).ordered())
+        self.assertEqual(with_index.best(), ScheduleSearch(self.sections, prefs).best())
+
+    def test_top_k_is_sorted_brute_force(self):
+        prefs = {"preferred_time": "morning"}
+        found = brute_force_schedules(self.sections, prefs)
+        # stable sort keeps the combinations order for ties
+        ranked = sorted(found, key=lambda item: -score_schedule(item[0], prefs))
+        expected = [
+            (tuple(s.pk for s in combo), credits, score_schedule(combo, prefs))
+            for combo, credits in ranked[:7]
+        ]
+        self.assertEqual(ScheduleSearch(self.sections, prefs).top(7), expected)
+
+    def test_branch_and_bound_matches_exhaustive(self):
+        for prefs in [{}, {"preferred_time": "morning"}, {"preferred_time": "afternoon", "avoid_days": ["F"]}]:
+            for k in (1, 4):
+                exhaustive = ScheduleSearch(self.sections, prefs)
+                bounded = ScheduleSearch(self.sections, prefs, branch_and_bound=True)
+                self.assertEqual(bounded.top(k), exhaustive.top(k))
+                self.assertLessEqual(bounded.stats["nodes"], exhaustive.stats["nodes"])
+
+    def test_parallel_matches_serial(self):
+        prefs = {"preferred_time": "afternoon"}
+        serial = ScheduleSearch(self.sections, prefs, branch_and_bound=True)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for k in (1, 5):
+                winners, stats, complete = parallel_top(self.sections, prefs, k, executor=executor)
+                self.assertEqual(winners, serial.top(k))
+                self.assertTrue(complete)
+                self.assertGreater(stats["nodes"], 0)
+
+    @override_settings(SCHEDULE_PARALLEL_WORKERS=2, SCHEDULE_PARALLEL_THRESHOLD=1)
+    def test_should_parallelize(self):
+        self.assertTrue(should_parallelize(self.sections))
+        with override_settings(SCHEDULE_PARALLEL_THRESHOLD=10 ** 9):
+            self.assertFalse(should_parallelize(self.sections))
+
+    def test_api_top_k(self):
+        course_ids = list(Course.objects.values_list('id', flat=True))
+        prefs = {"preferred_time": "morning"}
+        single = self.client.post('/api/generate-schedules/', {
+            "selected_courses": course_ids, "preferences": prefs,
+        }, content_type='application/json').json()
+        many = self.client.post('/api/generate-schedules/', {
+            "selected_courses": course_ids, "preferences": prefs, "top_k": 3,
+        }, content_type='application/json').json()
+        self.assertEqual(len(many["schedules"]), 3)
+        single.pop("stats")
+        self.assertTrue(single.pop("complete"))
+        self.assertEqual(many["schedules"][0], single)
+        self.assertGreaterEqual(many["schedules"][1]["score"], many["schedules"][2]["score"])
+
+        bad = self.client.post('/api/generate-schedules/', {
+            "selected_courses": course_ids, "top_k": 0,
+        }, content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+        for path in ('', 'session/', 'count/', 'batch/', 'stream/'):
+            bad = self.client.post(f'/api/generate-schedules/{path}', [1, 2], content_type='application/json')
+            self.assertEqual(bad.status_code, 400)
+        # a bad selection is reported as such, not as a bad required_courses
+        for path in ('', 'session/', 'count/', 'stream/', 'async/'):
+            bad = self.client.post(f'/api/generate-schedules/{path}', {
+                "selected_courses": ["x"], "required_courses": [course_ids[0]],
+            }, content_type='application/json')
+            self.assertEqual(bad.status_code, 400)
+            self.assertEqual(list(bad.json()), ["selected_courses"])
+
+    def test_no_schedule(self):
+        self.assertIsNone(ScheduleSearch(self.sections[:1]).best())
+
+    @mock.patch('scheduler.search.STOP_CHECK_INTERVAL', 10)
+    def test_stop_ends_search_early(self):
+        search = ScheduleSearch(self.sections, stop=lambda: True)
+        search.top(1)
+        self.assertFalse(search.complete)
+        self.assertEqual(search.stats["nodes"], 10)
+
+    def test_collapse_matches_sections(self):
+        # copies that differ only in section number and instructor
+        for s in self.sections[::2]:
+            CourseSection.objects.create(course=s.course, section_number=s.section_number + "b",
+                                         instructor="Other", days=s.days,
+                                         start_time=s.start_time, end_time=s.end_time)
+        sections = list(CourseSection.objects.select_related('course').order_by('id'))
+        conflicts = conflict_adjacency(sections)
+        for prefs in [{}, {"preferred_time": "morning"}, {"preferred_time": "afternoon", "avoid_days": ["F"]}]:
+            for k in (1, 6, 40):
+                for adjacency in (None, conflicts):
+                    plain = ScheduleSearch(sections, prefs, conflicts=adjacency, branch_and_bound=True)
+                    collapsed = ScheduleSearch(sections, prefs, conflicts=adjacency, branch_and_bound=True,
+                                               collapse=True)
+                    self.assertEqual(collapsed.top(k), plain.top(k))
+                    self.assertLess(collapsed.stats["nodes"], plain.stats["nodes"])
+
+        # tied schedules are only expanded while they can still make the top k
+        collapsed = ScheduleSearch(sections, conflicts=conflicts, branch_and_bound=True, collapse=True)
+        expand = collapsed._expand
+        expanded = []
+        with mock.patch.object(collapsed, '_expand',
+                               lambda *args: (expanded.append(e) or e for e in expand(*args))):
+            self.assertEqual(collapsed.top(1), ScheduleSearch(sections, branch_and_bound=True).top(1))
+        self.assertLess(len(expanded), collapsed.stats["schedules"] // 10)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            winners, _, _ = parallel_top(sections, {"preferred_time": "morning"}, 6, executor=executor)
+        self.assertEqual(winners, ScheduleSearch(sections, {"preferred_time": "morning"}).top(6))
+        with self.assertRaises(ValueError):
+            ScheduleSearch(sections, collapse=True).ordered()
+
+
+class ScheduleBatchTests(SampleCatalogTestCase):
+    @override_settings(SCHEDULE_PARALLEL_WORKERS=2)
+    def test_batch_matches_single_requests(self):
+        course_ids = list(Course.objects.values_list('id', flat=True))
+        requests = [
+            {"selected_courses": course_ids, "preferences": {"preferred_time": "morning"}, "top_k": 3},
+            {"selected_courses": course_ids[:4], "preferences": {"avoid_days": ["F"]}},
+            {"selected_courses": course_ids[:1]},
+            {"selected_courses": course_ids, "top_k": 0},
+            {"selected_courses": course_ids, "preferences": {"preferred_time": "morning"}, "top_k": 3},
+            {"selected_courses": course_ids, "required_courses": course_ids[:2], "top_k": 2,
+             "time_budget_ms": 5000},
+            {"selected_courses": course_ids[:2], "required_courses": course_ids[2:3]},
+        ]
+        for concurrent in (False, True):
+            cache.clear()
+            response = self.client.post('/api/generate-schedules/batch/', {
+                "requests": requests, "concurrent": concurrent,
+            }, content_type='application/json')
+            results = response.json()["results"]
+            self.assertIn("error", results[3])
+            self.assertIn("propagation", results[5])
+            self.assertIn("error", results[6])
+            for request, result in zip(requests, results):
+                if result and "error" in result:
+                    continue
+                cache.clear()
+                response = self.client.post('/api/generate-schedules/', request,
+                                            content_type='application/json')
+                single = json.loads(response.content or b"null")
+                for body in (single, result):
+                    if body and "stats" in body:
+                        body["stats"].pop("elapsed_ms")
+                self.assertEqual(result, single)
+
+        bad = self.client.post('/api/generate-schedules/batch/', {"requests": []},
+                               content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+
+
+class SolverSessionTests(SampleCatalogTestCase):
+    def test_session_resolves_incrementally(self):
+        solver_states.clear()
+        course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+        steps = [
+            ({"selected_courses": course_ids[:4]}, "new"),
+            ({"selected_courses": course_ids[:5]}, "incremental"),
+            ({"selected_courses": course_ids[1:5]}, "incremental"),
+            ({"selected_courses": course_ids[1:5], "preferences": {"avoid_days": ["F"]}}, "incremental"),
+            ({"selected_courses": course_ids, "preferences": {"avoid_days": ["F"], "earliest_start": "09:00"},
+              "top_k": 3}, "incremental"),
+            ({"selected_courses": course_ids, "preferences": {"preferred_time": "morning"}, "top_k": 3}, "rebuild"),
+            ({"selected_courses": course_ids, "preferences": {"preferred_time": "morning"}, "top_k": 3,
+              "required_courses": course_ids[1:3], "time_budget_ms": 5000}, "incremental"),
+        ]
+        token = None
+        for body, mode in steps:
+            response = self.client.post('/api/generate-schedules/session/', {**body, "session": token},
+                                        content_type='application/json').json()
+            self.assertEqual(response["stats"]["mode"], mode)
+            token = response.pop("session")
+            response.pop("stats")
+
+            single = self.client.post('/api/generate-schedules/', body, content_type='application/json').json()
+            single.pop("stats")
+            self.assertEqual(response, single)
+
+    @override_settings(SCHEDULE_SESSION_MAX_PARTIALS=1, SCHEDULE_SESSION_MAX_STATES=1)
+    def test_session_limits(self):
+        solver_states.clear()
+        body = {"selected_courses": list(Course.objects.values_list('id', flat=True)), "top_k": 2}
+        first = self.client.post('/api/generate-schedules/session/', body,
+                                 content_type='application/json').json()
+        self.assertEqual(first["stats"]["mode"], "search")
+        single = self.client.post('/api/generate-schedules/', body, content_type='application/json').json()
+        self.assertEqual(first["schedules"], single["schedules"])
+        required = {**body, "required_courses": body["selected_courses"][:2]}
+        searched = self.client.post('/api/generate-schedules/session/', required,
+                                    content_type='application/json').json()
+        single = self.client.post('/api/generate-schedules/', required, content_type='application/json').json()
+        self.assertEqual(searched["schedules"], single["schedules"])
+
+        # a second session evicts the first
+        self.client.post('/api/generate-schedules/session/', body, content_type='application/json')
+        again = self.client.post('/api/generate-schedules/session/', {**body, "session": first["session"]},
+                                 content_type='application/json').json()
+        self.assertNotEqual(again["session"], first["session"])
+
+
+    @override_settings(SCHEDULE_SESSION_MAX_PARTIALS=20)
+    def test_session_overflow_after_tighter_preferences(self):
+        solver_states.clear()
+        course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+        steps = [
+            ({"selected_courses": course_ids}, "search"),
+            ({"selected_courses": course_ids[:4], "preferences": {"avoid_days": ["F"], "earliest_start": "10:00"}},
+             None),
+            ({"selected_courses": course_ids}, "search"),
+        ]
+        token = None
+        for body, mode in steps:
+            body = {**body, "top_k": 3}
+            response = self.client.post('/api/generate-schedules/session/', {**body, "session": token},
+                                        content_type='application/json').json()
+            token = response.pop("session")
+            if mode is not None:
+                self.assertEqual(response["stats"]["mode"], mode)
+            single = self.client.post('/api/generate-schedules/', body, content_type='application/json').json()
+            self.assertEqual(response.get("schedules"), single.get("schedules"))
+            self.assertEqual(response.get("infeasible"), single.get("infeasible"))
+
+
+class ScheduleStreamTests(SampleCatalogTestCase):
+    def test_stream_resumes_after_cursor(self):
+        search = ScheduleSearch(self.sections, {"earliest_start": "09:00"})
+        everything = list(search.stream())
+        self.assertEqual(sorted(everything), sorted(search.top(len(everything) + 1)))
+        for cut in (0, 5, len(everything) - 1):
+            resumed = list(search.stream(after=everything[cut][0]))
+            self.assertEqual(resumed, everything[cut + 1:])
+
+    def test_api_stream(self):
+        body = {"selected_courses": list(Course.objects.values_list('id', flat=True)), "limit": 4}
+        response = self.client.post('/api/generate-schedules/stream/', body, content_type='application/json')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        first = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(first), 4)
+
+        body.update(cursor=first[1]["cursor"], limit=2)
+        response = self.client.post('/api/generate-schedules/stream/', body, content_type='application/json')
+        resumed = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(resumed, first[2:4])
+
+        body["cursor"] = "999999"
+        response = self.client.post('/api/generate-schedules/stream/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        required = body["selected_courses"][:2]
+        response = self.client.post('/api/generate-schedules/stream/', {
+            "selected_courses": body["selected_courses"], "required_courses": required,
+        }, content_type='application/json')
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertTrue(lines)
+        for line in lines:
+            self.assertLessEqual(set(required), {s["course"]["id"] for s in line["sections"]})
+        response = self.client.post('/api/generate-schedules/stream/', {**body, "time_budget_ms": 100},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncScheduleTests(SampleCatalogTestCase):
+    async def test_async_endpoint_matches_sync(self):
+        course_ids = [c async for c in Course.objects.order_by('id').values_list('id', flat=True)]
+        bodies = [
+            {"selected_courses": course_ids, "preferences": {"preferred_time": "afternoon"}, "top_k": 3},
+            {"selected_courses": course_ids, "required_courses": course_ids[:2], "top_k": 3},
+        ]
+        for body in bodies:
+            async_response = await self.async_client.post(
+                '/api/generate-schedules/async/', body, content_type='application/json')
+            sync_response = await self.async_client.post(
+                '/api/generate-schedules/', body, content_type='application/json')
+            self.assertEqual(async_response.status_code, 200)
+            async_body, sync_body = async_response.json(), sync_response.json()
+            # timings differ
+            async_body["stats"].pop("elapsed_ms")
+            sync_body["stats"].pop("elapsed_ms")
+            self.assertEqual(async_body, sync_body)
+
+        response = await self.async_client.post('/api/generate-schedules/async/', {
+            "selected_courses": course_ids[:1], "required_courses": course_ids[1:2],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        # a required course the preferences leave without sections
+        late = await Course.objects.acreate(code="LATE", title="Late", credits=3)
+        await CourseSection.objects.acreate(course=late, section_number="01", days=["M"],
+                                            start_time=time(7, 0), end_time=time(7, 50))
+        await sync_to_async(bump_catalog_version)()
+        body = {"selected_courses": course_ids + [late.id], "required_courses": [late.id],
+                "preferences": {"earliest_start": "08:00"}}
+        async_response = await self.async_client.post('/api/generate-schedules/async/', body,
+                                                      content_type='application/json')
+        sync_response = await self.async_client.post('/api/generate-schedules/', body,
+                                                     content_type='application/json')
+        self.assertEqual(async_response.status_code, 200)
+        self.assertIn("LATE", async_response.json()["infeasible"]["reason"])
+        self.assertEqual(async_response.json(), sync_response.json())
+
+        for bad in (b"[1, 2]", b"3", b"{"):
+            response = await self.async_client.post('/api/generate-schedules/async/', bad,
+                                                    content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+    @override_settings(SCHEDULE_REQUEST_TIMEOUT=0)
+    async def test_async_endpoint_deadline(self):
+        # one search step, then the deadline has passed
+        body = {"selected_courses": [c async for c in Course.objects.values_list('id', flat=True)]}
+        with mock.patch('scheduler.search.STOP_CHECK_INTERVAL', 1):
+            response = await self.async_client.post(
+                '/api/generate-schedules/async/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 504)
+
+
+class ConflictReportTests(SampleCatalogTestCase):
+    def test_conflict_report_matches_all_pairs(self):
+        expected = [(a, b) for i, a in enumerate(self.sections) for b in self.sections[i + 1:] if has_conflict(a, b)]
+        self.assertEqual([(a, b) for a, b, _ in find_conflicts(self.sections)], expected)
+
+    def test_conflict_report_api(self):
+        course = self.sections[0].course
+        response = self.client.get('/api/sections/conflicts/', {"course": course.id, "day": "M", "page_size": 2})
+        data = response.json()
+        expected = [
+            (a.pk, b.pk) for a, b, days in find_conflicts(self.sections)
+            if course.id in (a.course_id, b.course_id) and "M" in days
+        ]
+        self.assertEqual(data["count"], len(expected))
+        self.assertEqual([(r["section_a"]["id"], r["section_b"]["id"]) for r in data["results"]], expected[:2])
+        self.assertEqual(data["results"][0]["days"], ["M"])
+        self.assertEqual(self.client.get('/api/sections/conflicts/', {"day": "Sa"}).status_code, 400)
+
+
+class ScheduleCountTests(SampleCatalogTestCase):
+    def test_counter_matches_brute_force(self):
+        CourseSection.objects.create(course=self.sections[0].course, section_number="09",
+                                     days=self.sections[0].days, start_time=self.sections[0].start_time,
+                                     end_time=self.sections[0].end_time)
+        sections = list(CourseSection.objects.select_related('course').order_by('id'))
+        for prefs in [{}, {"max_classes_per_day": 2}, {"max_classes_per_day": 1}]:
+            found = brute_force_schedules(sections, prefs)
+            result = ScheduleCounter(sections, prefs).count()
+            self.assertEqual(result, {"count": len(found), "exact": True})
+        required = {self.sections[0].course_id, self.sections[3].course_id}
+        expected = sum(required <= {s.course_id for s in combo} for combo, _ in brute_force_schedules(sections, {}))
+        self.assertEqual(ScheduleCounter(sections, required=required).count()["count"], expected)
+
+    def test_counter_bounds_when_stopped(self):
+        counter = ScheduleCounter(self.sections, stop=lambda: True)
+        with mock.patch('scheduler.counting.STOP_CHECK_INTERVAL', 1):
+            result = counter.count()
+        self.assertFalse(result["exact"])
+        self.assertLessEqual(result["lower_bound"], len(brute_force_schedules(self.sections, {})))
+        self.assertGreaterEqual(result["upper_bound"], len(brute_force_schedules(self.sections, {})))
+
+    def test_count_api(self):
+        course_ids = list(Course.objects.values_list('id', flat=True))
+        prefs = {"avoid_days": ["F"]}
+        data = self.client.post('/api/generate-schedules/count/', {
+            "selected_courses": course_ids, "preferences": prefs,
+        }, content_type='application/json').json()
+        self.assertEqual(data["count"], len(brute_force_schedules(self.sections, prefs)))
+        self.assertTrue(data["exact"])
+        data = self.client.post('/api/generate-schedules/count/', {
+            "selected_courses": course_ids[:1],
+        }, content_type='application/json').json()
+        self.assertEqual(data["count"], 0)
+        self.assertIn("reason", data["infeasible"])
+
+
+class CatalogSnapshotTests(SampleCatalogTestCase):
+    def test_snapshot_serves_hot_path(self):
+        course_ids = list(Course.objects.values_list('id', flat=True))
+        self.client.post('/api/generate-schedules/', {"selected_courses": course_ids},
+                         content_type='application/json')
+        old = catalog_snapshot()
+        with self.assertNumQueries(0):
+            data = self.client.post('/api/generate-schedules/', {
+                "selected_courses": course_ids, "preferences": {"preferred_time": "morning"}, "top_k": 3,
+            }, content_type='application/json').json()
+            self.client.get('/api/sections/conflicts/')
+        by_id = {s.pk: s for s in self.sections}
+        for schedule in data["schedules"]:
+            self.assertEqual(schedule["sections"],
+                             [CourseSectionReadSerializer(by_id[s["id"]]).data for s in schedule["sections"]])
+        self.assertEqual(old.conflicts(old.course_sections(course_ids)), conflict_adjacency(self.sections))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            added = CourseSection.objects.create(course=self.sections[0].course, section_number="99",
+                                                 days=["F"], start_time=time(16, 0), end_time=time(17, 0))
+        self.assertIn(added.pk, catalog_snapshot().sections)
+        self.assertNotIn(added.pk, old.sections)
+
+        # overlaps come from the pattern graph, registered again if it was lost
+        MeetingPattern.objects.all().delete()
+        bump_catalog_version()
+        new = catalog_snapshot()
+        sections = new.course_sections(course_ids)
+        self.assertEqual(new.conflicts(sections), conflict_adjacency(sections))
+        self.assertTrue(MeetingPattern.objects.filter(key='F|960|1020').exists())
+
+
+class RequiredCoursesTests(SampleCatalogTestCase):
+    def test_required_matches_brute_force(self):
+        required = {self.sections[0].course_id, self.sections[5].course_id}
+        prefs = {"preferred_time": "morning"}
+        found = [(combo, credits) for combo, credits in brute_force_schedules(self.sections, prefs)
+                 if required <= {s.course_id for s in combo}]
+        ranked = sorted(found, key=lambda item: -score_schedule(item[0], prefs))
+        expected = [
+            (tuple(s.pk for s in combo), credits, score_schedule(combo, prefs))
+            for combo, credits in ranked[:5]
+        ]
+        conflicts = conflict_adjacency(self.sections)
+        kept, pruned, empty = reduce_domains(self.sections, required, conflicts)
+        self.assertEqual(empty, set())
+        # pruned sections appear in no valid schedule
+        dead = {s.pk for s, _ in pruned}
+        self.assertFalse(dead & {s.pk for combo, _ in found for s in combo})
+        search = ScheduleSearch(kept, prefs, conflicts=conflicts, branch_and_bound=True, required=required)
+        self.assertEqual(search.top(5), expected)
+
+    def test_required_courses_keep_a_slot(self):
+        # seven courses that never clash; the required ones meet in the afternoon
+        courses = []
+        for i, (day, hour) in enumerate([("M", 9), ("T", 14), ("W", 9), ("Th", 15), ("F", 9),
+                                         ("M", 10), ("T", 10)]):
+            course = Course.objects.create(code=f"C10{i}", title=f"Course 10{i}", credits=3)
+            CourseSection.objects.create(course=course, section_number="01", days=[day],
+                                         start_time=time(hour, 0), end_time=time(hour, 50))
+            courses.append(course)
+        ids = [c.id for c in courses]
+        required = {ids[1], ids[3]}
+        body = {"selected_courses": ids, "required_courses": sorted(required),
+                "preferences": {"preferred_time": "morning"}, "top_k": 10}
+        for path in ('', 'session/'):
+            data = self.client.post(f'/api/generate-schedules/{path}', body,
+                                    content_type='application/json').json()
+            self.assertTrue(data["schedules"])
+            for schedule in data["schedules"]:
+                self.assertLessEqual(required, {s["course"]["id"] for s in schedule["sections"]})
+
+        response = self.client.post('/api/generate-schedules/stream/', body, content_type='application/json')
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertTrue(lines)
+        for line in lines:
+            self.assertLessEqual(required, {s["course"]["id"] for s in line["sections"]})
+        resumed = self.client.post('/api/generate-schedules/stream/', {**body, "cursor": lines[0]["cursor"]},
+                                   content_type='application/json')
+        self.assertEqual(resumed.status_code, 200)
+
+    def test_required_propagation_api(self):
+        a = Course.objects.create(code="REQA", title="A", credits=4)
+        b = Course.objects.create(code="REQB", title="B", credits=4)
+        CourseSection.objects.create(course=a, section_number="01", days=["M", "W"],
+                                     start_time=time(9, 0), end_time=time(10, 15))
+        clash = CourseSection.objects.create(course=b, section_number="01", days=["M"],
+                                             start_time=time(9, 30), end_time=time(10, 0))
+        other = Course.objects.get(code="C2")
+        body = {"selected_courses": [a.id, b.id, other.id], "required_courses": [a.id, b.id]}
+        data = self.client.post('/api/generate-schedules/', body, content_type='application/json').json()
+        self.assertIn("REQB", data["infeasible"]["reason"])
+        self.assertEqual(data["propagation"]["pruned"][0]["blocked_by"], "REQA")
+
+        clash.days = ["T"]
+        with self.captureOnCommitCallbacks(execute=True):
+            clash.save()
+        data = self.client.post('/api/generate-schedules/', {**body, "top_k": 3},
+                                content_type='application/json').json()
+        self.assertNotIn("infeasible", data)
+        self.assertTrue(data["schedules"])
+        for schedule in data["schedules"]:
+            codes = {s["course"]["code"] for s in schedule["sections"]}
+            self.assertLessEqual({"REQA", "REQB"}, codes)
+
+        body["required_courses"] = [a.id, 10 ** 6]
+        response = self.client.post('/api/generate-schedules/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ConflictIndexTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(code="CSCI-210", title="Data Structures", credits=3)
+        self.other = Course.objects.create(code="MATH-120", title="Calculus I", credits=4)
+        self.a = CourseSection.objects.create(
+            course=self.course, section_number="01",
+            days=["M", "W"], start_time=time(9, 0), end_time=time(10, 0),
+        )
+
+    def adjacency(self, *sections):
+        return conflict_adjacency(CourseSection.objects.filter(pk__in=[s.pk for s in sections]))
+
+    def test_insert_edit_delete(self):
+        b = CourseSection.objects.create(
+            course=self.other, section_number="01",
+            days=["W"], start_time=time(9, 30), end_time=time(10, 30),
+        )
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: {b.pk}, b.pk: {self.a.pk}})
+
+        b.days = ["F"]
+        b.save()
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: set(), b.pk: set()})
+
+        b.days = ["M"]
+        b.save()
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: {b.pk}, b.pk: {self.a.pk}})
+
+        b.delete()
+        self.assertEqual(self.adjacency(self.a), {self.a.pk: set()})
+
+    def test_same_pattern_conflicts(self):
+        b = CourseSection.objects.create(
+            course=self.other, section_number="01",
+            days=["W", "M"], start_time=time(9, 0), end_time=time(10, 0),
+        )
+        self.assertEqual(MeetingPattern.objects.count(), 1)
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: {b.pk}, b.pk: {self.a.pk}})
+
+    def test_writes_without_signals(self):
+        # a fixture load (raw save) and a QuerySet.update() that skips save()
+        fixture = serializers.serialize('json', [CourseSection(
+            pk=1000, course=self.other, section_number="02",
+            days=["M"], start_time=time(9, 30), end_time=time(10, 30),
+        )])
+        for obj in serializers.deserialize('json', fixture):
+            obj.save()
+        b = CourseSection.objects.get(pk=1000)
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: {b.pk}, b.pk: {self.a.pk}})
+
+        MeetingPattern.objects.all().delete()
+        CourseSection.objects.filter(pk=b.pk).update(start_time=time(9, 45))
+        self.assertEqual(self.adjacency(self.a, b), {self.a.pk: {b.pk}, b.pk: {self.a.pk}})
+
+    def test_rebuild_command(self):
+        MeetingPattern.objects.all().delete()
+        call_command('rebuild_conflicts', stdout=io.StringIO())
+        self.assertEqual(list(MeetingPattern.objects.values_list('key', flat=True)), ["M,W|540|600"])
+        self.assertEqual(MeetingPattern.objects.get().conflicts.count(), 1)
+
+class ScheduleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.courses = []
+        for i, (days, credits) in enumerate([(["M"], 4), (["T"], 4), (["W"], 4), (["Th"], 4)]):
+            course = Course.objects.create(code=f"C{i}", title=f"Course {i}", credits=credits)
+            CourseSection.objects.create(
+                course=course, section_number="01",
+                days=days, start_time=time(9, 0), end_time=time(10, 0),
+            )
+            self.courses.append(course)
+
+    def generate(self, course_ids, prefs):
+        return self.client.post('/api/generate-schedules/', {
+            "selected_courses": course_ids, "preferences": prefs,
+        }, content_type='application/json').json()
+
+    def test_hit_for_equivalent_request(self):
+        ids = [c.id for c in self.courses]
+        before = cache_stats()
+        first = self.generate(ids, {"avoid_days": ["F", "Sa"], "earliest_start": ""})
+        second = self.generate(list(reversed(ids)), {"avoid_days": ["Sa", "F"]})
+        after = cache_stats()
+        self.assertEqual(first, second)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_prefilter_explains_infeasible_preferences(self):
+        ids = [c.id for c in self.courses]
+        get_catalog_version()  # read the version first
+        # snapshot load (sections, patterns, pattern graph), then two to explain
+        with self.assertNumQueries(5):
+            body = self.generate(ids, {"avoid_days": ["M", "T"]})
+        self.assertIn("at most 8 credits", body["infeasible"]["reason"])
+        self.assertEqual(
+            [(c["code"], c["removed_by"]["avoid_days"]) for c in body["infeasible"]["courses"]],
+            [("C0", 1), ("C1", 1)],
+        )
+        body = self.generate(ids, {"earliest_start": "09:30"})
+        self.assertIn("Only 0 of", body["infeasible"]["reason"])
+        self.assertEqual(self.generate(ids, {"earliest_start": "08:00"})["total_credits"], 12)
+
+    @mock.patch('scheduler.search.STOP_CHECK_INTERVAL', 1)
+    def test_time_budget_returns_best_so_far_uncached(self):
+        ids = [c.id for c in self.courses]
+        with mock.patch('scheduler.views_api.deadline_stop', return_value=lambda: True):
+            partial = self.client.post('/api/generate-schedules/', {
+                "selected_courses": ids, "time_budget_ms": 1,
+            }, content_type='application/json').json()
+        self.assertFalse(partial["complete"])
+        self.assertIn("nodes", partial["stats"])
+
+        full = self.generate(ids, {})
+        self.assertTrue(full["complete"])
+        self.assertEqual(full["total_credits"], 12)
+
+        bad = self.client.post('/api/generate-schedules/', {
+            "selected_courses": ids, "time_budget_ms": "soon",
+        }, content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+
+    @override_settings(SCHEDULE_PROFILING=True)
+    def test_profiling(self):
+        reset_metrics()
+        ids = [c.id for c in self.courses]
+        response = self.client.post('/api/generate-schedules/', {"selected_courses": ids},
+                                    content_type='application/json')
+        debug = response.json()["debug"]
+        self.assertEqual(set(debug["phases_ms"]), {"fetch", "conflicts", "search", "serialize"})
+        self.assertGreater(debug["db"]["queries"], 0)
+        self.assertGreater(debug["search"]["nodes"], 0)
+        self.assertIn("search;dur=", response["Server-Timing"])
+
+        # cache hit: no search phase this time
+        self.client.post('/api/generate-schedules/', {"selected_courses": ids},
+                         content_type='application/json')
+        paths = self.client.get('/api/metrics/').json()["paths"]
+        entry = paths['/api/generate-schedules/']
+        self.assertEqual(entry["requests"], 2)
+        self.assertEqual(entry["search"]["nodes"], debug["search"]["nodes"])
+
+        # unknown paths share one entry instead of adding one each
+        self.client.get('/api/no-such-thing/')
+        self.client.get('/api/no-such-thing/else/')
+        paths = self.client.get('/api/metrics/').json()["paths"]
+        self.assertEqual(paths[UNMATCHED]["requests"], 2)
+        self.assertNotIn('/api/no-such-thing/', paths)
+
+        with override_settings(SCHEDULE_PROFILING=False):
+            response = self.client.post('/api/generate-schedules/', {"selected_courses": ids},
+                                        content_type='application/json')
+        self.assertNotIn("debug", response.json())
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_version_is_shared(self):
+        # kept in the database, not in this process's cache
+        version = bump_catalog_version()
+        cache.clear()
+        self.assertEqual(get_catalog_version(), version)
+        self.assertEqual(CatalogVersion.objects.get().value, version)
+
+        # memoized: no query until the entry expires, then another
+        # process's bump shows up
+        CatalogVersion.objects.update(value=version + 10)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_catalog_version(), version)
+        cache.delete(CATALOG_VERSION_KEY)
+        self.assertEqual(get_catalog_version(), version + 10)
+
+    def test_write_invalidates(self):
+        ids = [c.id for c in self.courses]
+        self.assertEqual(self.generate(ids, {})["total_credits"], 12)
+
+        self.courses[0].credits = 7
+        with self.captureOnCommitCallbacks(execute=True):
+            self.courses[0].save()
+        self.assertEqual(self.generate(ids, {})["total_credits"], 15)
+
+        version = cache_stats()["catalog_version"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/sections/create/', {
+                "course_id": self.courses[0].id, "section_number": "02",
+                "days": ["F"], "start_time": "09:00", "end_time": "10:00",
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(cache_stats()["catalog_version"], version)
+
+    def test_version_bumps_after_commit(self):
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.courses[0].credits = 7
+                self.courses[0].save()
+                CourseSection.objects.filter(course=self.courses[0]).delete()
+                # readers must not see the new version with pre-commit rows
+                self.assertEqual(get_catalog_version(), version)
+        self.assertGreater(get_catalog_version(), version)
+
+
+class EnrollmentAuditTests(TestCase):
+    def setUp(self):
+        course = Course.objects.create(code="CS101", title="Intro", credits=3)
+        other = Course.objects.create(code="MA101", title="Calc", credits=4)
+        self.a = CourseSection.objects.create(course=course, section_number="01", days=["M", "W"],
+                                              start_time=time(9, 0), end_time=time(10, 15))
+        self.b = CourseSection.objects.create(course=other, section_number="01", days=["W", "F"],
+                                              start_time=time(10, 0), end_time=time(11, 0))
+        self.c = CourseSection.objects.create(course=other, section_number="02", days=["T"],
+                                              start_time=time(9, 0), end_time=time(10, 0))
+        self.ada = Student.objects.create(name="Ada")
+        self.bob = Student.objects.create(name="Bob")
+        for student, section, semester in [
+            (self.ada, self.a, "Fall"), (self.ada, self.b, "Fall"), (self.ada, self.c, "Fall"),
+            (self.bob, self.a, "Fall"), (self.bob, self.c, "Fall"), (self.bob, self.b, "Spring"),
+        ]:
+            Enrollment.objects.create(student=student, section=section, semester=semester, year=2025)
+
+    def test_audit_finds_clashes_in_one_query(self):
+        with self.assertNumQueries(1):
+            clashes = list(audit_term("Fall", 2025))
+        self.assertEqual(clashes, [{
+            "student": {"id": self.ada.id, "name": "Ada"},
+            "section_a": {"id": self.a.id, "course": "CS101", "section_number": "01"},
+            "section_b": {"id": self.b.id, "course": "MA101", "section_number": "01"},
+            "days": ["W"],
+        }])
+        self.assertEqual(list(audit_term("Fall", 2025, student_id=self.bob.id)), [])
+
+    def test_audit_api_streams(self):
+        response = self.client.get('/api/enrollments/audit/', {"semester": "Fall", "year": 2025})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([line["student"]["name"] for line in lines], ["Ada"])
+        self.assertEqual(self.client.get('/api/enrollments/audit/', {"semester": "Fall"}).status_code, 400)
+
+
+class CatalogPayloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        course = Course.objects.create(code="CS101", title="Intro", credits=3)
+        CourseSection.objects.create(course=course, section_number="01", days=["M"],
+                                     start_time=time(9, 0), end_time=time(10, 0))
+
+    def test_conditional_get(self):
+        for url in ('/api/courses/', '/api/sections/'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(len(first.json()), 1)
+            etag = first['ETag']
+
+            with self.assertNumQueries(0):
+                again = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(again.status_code, 304)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(url).content, first.content)
+
+    def test_fast_sections_match_serializer(self):
+        course = Course.objects.create(code="CS102", title="Next", credits=4)
+        CourseSection.objects.create(course=course, section_number="02", instructor="Ada",
+                                     days=["T", "Th"], start_time=time(13, 0), end_time=time(14, 15))
+        expected = CourseSectionReadSerializer(
+            CourseSection.objects.select_related('course').order_by('id'), many=True).data
+        self.assertEqual(self.client.get('/api/sections/').json(), json.loads(json.dumps(expected)))
+
+        response = self.client.get('/api/sections/', {"course_id": course.id, "fields": "days,id"})
+        self.assertEqual(response.json(), [{"id": expected[1]["id"], "days": ["T", "Th"]}])
+        self.assertEqual(self.client.get('/api/sections/', {"fields": "room"}).status_code, 400)
+
+        first = self.client.get('/api/sections/', {"page_size": 1}).json()
+        self.assertEqual(first["results"], [json.loads(json.dumps(expected[0]))])
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(second["results"][0]["id"], expected[1]["id"])
+        self.assertIsNone(second["next"])
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/courses/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/courses/create/', {"code": "CS102", "title": "Next", "credits": 3},
+                             content_type='application/json')
+        response = self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["code"] for c in response.json()], ["CS101", "CS102"])
+
+
+class CatalogImportTests(TestCase):
+    CSV = (
+        "course_code,course_title,credits,section_number,instructor,days,start_time,end_time\n"
+        "CSCI-210,Data Structures,3,01,Ada,\"M,W\",09:00,10:15\n"
+        "CSCI-210,Data Structures,3,02,Ada,M W,10:15,11:30\n"
+        "MATH-120,Calculus I,4,01,,T Th,09:00,10:15\n"
+    )
+
+    def test_import_csv(self):
+        result = import_catalog(read_rows(self.CSV, 'csv'))
+        self.assertEqual(result, {"courses_created": 2, "sections_created": 3, "errors": []})
+        self.assertEqual(Course.objects.get(code="MATH-120").credits, 4)
+        self.assertEqual(list(CourseSection.objects.get(course__code="MATH-120").days), ["T", "Th"])
+
+    def test_every_error_reported_and_nothing_written(self):
+        Course.objects.create(code="CSCI-210", title="Data Structures", credits=3)
+        rows = read_rows(self.CSV, 'csv') + [
+            {"course_code": "CSCI-210", "section_number": "03", "days": "W",
+             "start_time": "09:30", "end_time": "10:00"},
+            {"course_code": "NEW-1", "section_number": "01", "days": "Sa",
+             "start_time": "11:00", "end_time": "10:00"},
+        ]
+        result = import_catalog(rows)
+        self.assertEqual([e["row"] for e in result["errors"]], [4, 5])
+        self.assertIn("Time conflict", result["errors"][0]["errors"][0])
+        self.assertEqual(len(result["errors"][1]["errors"]), 2)
+        self.assertEqual(CourseSection.objects.count(), 0)
+
+    def test_synthetic_catalog_is_reproducible_and_valid(self):
+        rows = synthetic_rows(10, 6, density=1, seed=3)
+        self.assertEqual(rows, synthetic_rows(10, 6, density=1, seed=3))
+        self.assertNotEqual(rows, synthetic_rows(10, 6, density=1, seed=4))
+        result = import_catalog(rows)
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(result["sections_created"], 60)
+        with self.assertRaises(ValueError):
+            synthetic_rows(1, 19)
+
+    def test_bulk_endpoint_indexes_conflicts(self):
+        rows = read_rows(self.CSV, 'csv') + [
+            {"course_code": "MATH-120", "section_number": "02", "days": ["M"],
+             "start_time": "09:30", "end_time": "10:30"},
+        ]
+        response = self.client.post('/api/sections/bulk/', rows, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["sections_created"], 4)
+
+        sections = {(s.course.code, s.section_number): s for s in CourseSection.objects.select_related('course')}
+        math_02 = sections[("MATH-120", "02")]
+        adjacency = conflict_adjacency(sections.values())
+        self.assertEqual(adjacency[math_02.pk], {sections[("CSCI-210", "01")].pk, sections[("CSCI-210", "02")].pk})
+
+
+class CancelOnDisconnectTests(TestCase):
+    async def test_cancels_request_on_disconnect(self):
+        from tessera.asgi import CancelOnDisconnect
+
+        cancelled = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await receive()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        messages = [{"type": "http.request", "body": b"", "more_body": False},
+                    {"type": "http.disconnect"}]
+
+        async def receive():
+            return messages.pop(0)
+
+        watched = CancelOnDisconnect(slow_app, paths=['/slow/'])
+        await asyncio.wait_for(watched({"type": "http", "path": "/slow/"}, receive, None), 5)
+        self.assertTrue(cancelled.is_set())
+
+    async def test_other_paths_pass_through(self):
+        from tessera.asgi import CancelOnDisconnect
+
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(receive)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await CancelOnDisconnect(app, paths=['/slow/'])({"type": "http", "path": "/other/"}, receive, None)
+        # the app got the server's receive, with no watcher in between
+        self.assertEqual(seen, [receive])
@@ -1,8 +1,71 @@
+DAY_CODES = ['M', 'T', 'W', 'Th', 'F']
+MINUTES_PER_DAY = 24 * 60
+
+# one bit per weekday, for CourseSection.day_mask
+DAY_BITS = {d: 1 << i for i, d in enumerate(DAY_CODES)}
+
+
 def has_conflict(section1, section2):
-    common_days = set(section1.days).intersection(section2.days)
-    if not common_days:
-        return False
-    return (
-        section1.start_time < section2.end_time and
-        section2.start_time < section1.end_time
-    )
\ No newline at end of file
+    return bool(section_mask(section1) & section_mask(section2))
+
+
+def time_to_minutes(t):
+    """Convert a datetime.time to minutes after midnight."""
+    if t is None:
+        return None
+    return t.hour * 60 + t.minute
+
+
+def parse_days(d):
+    """
+    Normalize a days value into a list like ['M','W'].
+    Works whether days is a list (MultiSelect) or 'M,W' string.
+    """
+    if isinstance(d, (list, tuple)):
+        return list(d)
+    if d is None:
+        return []
+    return [x.strip() for x in str(d).split(",") if x.strip()]
+
+
+def day_mask(days):
+    """['M','W'] -> 0b101; unknown day codes are ignored."""
+    mask = 0
+    for d in days:
+        mask |= DAY_BITS.get(d, 0)
+    return mask
+
+
+def mask_days(mask):
+    """0b101 -> ['M','W']."""
+    return [d for d in DAY_CODES if mask & DAY_BITS[d]]
+
+
+def get_section_days(section):
+    """Days of a section as a list like ['M','W']."""
+    return parse_days(section.days)
+
+
+def meeting_mask(days, start_min, end_min):
+    """
+    Pack a weekly meeting pattern into an int with one bit per minute of
+    the week (Monday 00:00 is bit 0). Two meetings overlap iff their masks
+    share a bit, and the time taken by a set of meetings is the OR of them.
+    """
+    if start_min is None or end_min is None or start_min >= end_min:
+        return 0
+    day_bits = ((1 << (end_min - start_min)) - 1) << start_min
+    mask = 0
+    for d in days:
+        if d in DAY_CODES:
+            mask |= day_bits << (DAY_CODES.index(d) * MINUTES_PER_DAY)
+    return mask
+
+
+def section_mask(section):
+    """Meeting mask of a CourseSection (or anything with days/start_time/end_time)."""
+    return meeting_mask(
+        get_section_days(section),
+        time_to_minutes(section.start_time),
+        time_to_minutes(section.end_time),
+    )
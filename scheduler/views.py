@@ -1,10 +1,11 @@
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django import forms
 from .models import Course
 from .models import CourseSection
-from .utils import has_conflict
-import itertools
+from .search import ScheduleSearch
+from .conflicts import conflict_adjacency
+from .conflict_report import find_conflicts
 
 def course_list(request):
     courses = Course.objects.all()
@@ -35,21 +36,14 @@ def add_course(request):
 
 def check_conflict_demo(request):
     """
-    Compare all CourseSections in the database and list any conflicting pairs.
+    List every pair of conflicting CourseSections in the database.
     """
-    sections = list(CourseSection.objects.all())
+    sections = list(CourseSection.objects.select_related('course').order_by('id'))
 
     if len(sections) < 2:
         return HttpResponse("Not enough sections to compare.")
 
-    conflicts = []
-
-    # Compare every pair of sections (A vs B)
-    for i in range(len(sections)):
-        for j in range(i + 1, len(sections)):
-            s1, s2 = sections[i], sections[j]
-            if has_conflict(s1, s2):
-                conflicts.append((s1, s2))
+    conflicts = [(s1, s2) for s1, s2, _ in find_conflicts(sections)]
 
     if not conflicts:
         return HttpResponse("No conflicts detected among current sections.")
@@ -73,44 +67,18 @@ def generate_schedules(request):
     if not sections:
         return HttpResponse("No sections available in the database.")
 
-    valid_combinations = []
-
-    for r in range(2, min(6, len(sections) + 1)):
-        for combo in itertools.combinations(sections, r):
-            # Avoid duplicate courses in the same schedule
-            course_ids = [s.course.id for s in combo]
-            if len(course_ids) != len(set(course_ids)):
-                continue
-
-            # Check for time conflicts
-            conflict_found = False
-            for i in range(len(combo)):
-                for j in range(i + 1, len(combo)):
-                    if has_conflict(combo[i], combo[j]):
-                        conflict_found = True
-                        break
-                if conflict_found:
-                    break
-
-            if conflict_found:
-                continue
-
-            # Calculate total credits
-            total_credits = sum(s.course.credits for s in combo)
-
-            # Filter schedules by credit range (12–18)
-            if 12 <= total_credits <= 18:
-                valid_combinations.append((combo, total_credits))
+    # one section per course, no conflicts, 12–18 credits
+    conflicts = conflict_adjacency(sections)
+    valid_combinations = ScheduleSearch(sections, conflicts=conflicts).ordered()
 
     if not valid_combinations:
         return HttpResponse("No valid schedules found within 12–18 credits.")
 
     # Display valid schedules with their total credits
-    message = "<h2>Valid Schedules (12–18 credits):</h2>"
-    for combo, credits in valid_combinations:
-        message += f"<p><strong>Total Credits: {credits}</strong></p><ul>"
-        for s in combo:
-            message += f"<li>{s} ({s.course.credits} credits)</li>"
-        message += "</ul>"
-
-    return HttpResponse(message)
\ No newline at end of file
+    def chunks():
+        yield "<h2>Valid Schedules (12–18 credits):</h2>"
+        for combo, credits in valid_combinations:
+            items = "".join(f"<li>{s} ({s.course.credits} credits)</li>" for s in combo)
+            yield f"<p><strong>Total Credits: {credits}</strong></p><ul>{items}</ul>"
+
+    return StreamingHttpResponse(chunks())
\ No newline at end of file
@@ -1,24 +1,92 @@
+import hashlib
+import itertools
+import json
+from functools import wraps
+from time import monotonic
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework import status
-from datetime import time
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 from .models import Course, CourseSection
-from .utils import has_conflict
+from .utils import DAY_BITS, DAY_CODES
+from .search import ScheduleSearch, deadline_stop
+from .solver_state import SolverState, store as solver_states
+from .caching import (
+    catalog_payload,
+    schedule_cache_key,
+    cached_schedules,
+    cache_stats,
+    get_catalog_version,
+    lookup_schedules,
+    store_schedules,
+)
+from .catalog_import import import_catalog, read_rows
+from .conflict_report import find_conflicts
+from .enrollment_audit import audit_term
+from .parallel import parallel_top, parallel_workers, search_many, should_parallelize
+from .prefilter import infeasibility, section_allowed
+from .propagation import propagate_required
+from .counting import ScheduleCounter
+from .snapshot import SnapshotSection, catalog_snapshot
+from .profiling import current_profile, metrics, phase, profiling_enabled, record_search
 from .serializers import (
     CourseSerializer,
     CourseSectionWriteSerializer,
     CourseSectionReadSerializer,
+    SECTION_COLUMNS,
+    SECTION_FIELDS,
+    section_dicts,
 )
-import itertools
+
+
+NOT_AN_OBJECT = "The request body must be a JSON object."
+
+
+def object_body(view):
+    """
+    Answer 400 unless the body parsed to an object (not a list or a
+    scalar), for views that read their fields with request.data.get().
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response({"detail": NOT_AN_OBJECT}, status=status.HTTP_400_BAD_REQUEST)
+        return view(request, *args, **kwargs)
+    return wrapped
+
+
+def catalog_response(request, name, render):
+    """
+    Serve a pre-rendered catalog listing (see caching.catalog_payload) with
+    ETag/Last-Modified, answering matching conditional GETs with 304.
+    """
+    payload = catalog_payload(name, render)
+    response = get_conditional_response(
+        request, etag=payload["etag"], last_modified=payload["last_modified"])
+    if response is None:
+        response = HttpResponse(payload["body"], content_type='application/json')
+    response['ETag'] = payload["etag"]
+    response['Last-Modified'] = http_date(payload["last_modified"])
+    # let browsers keep the body but always revalidate
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 @api_view(['GET'])
 def get_courses(request):
-    courses = Course.objects.all().order_by('code')
-    serializer = CourseSerializer(courses, many=True)
-    return Response(serializer.data)
+    def render():
+        courses = Course.objects.all().order_by('code')
+        return JSONRenderer().render(CourseSerializer(courses, many=True).data)
+    return catalog_response(request, "courses", render)
 
 @api_view(['POST'])
 @authentication_classes([])   # dev-only: allow POSTs from Vite without auth/CSRF
@@ -31,10 +99,72 @@ def create_course(request):
     return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class SectionCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+def parse_id_list(values):
+    """?x=1,2&x=3 -> [1, 2, 3]; None if the param is absent."""
+    if not values:
+        return None
+    try:
+        return sorted({int(v) for value in values for v in value.split(',') if v.strip()})
+    except ValueError:
+        raise ValueError("Must be a comma-separated list of integers.")
+
+
+def parse_fields(value):
+    """?fields=id,days -> ['id', 'days'] in SECTION_FIELDS order; None if absent."""
+    if not value:
+        return None
+    wanted = {f.strip() for f in value.split(',') if f.strip()}
+    unknown = wanted - set(SECTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return [f for f in SECTION_FIELDS if f in wanted]
+
+
 @api_view(['GET'])
 def get_sections(request):
-    sections = CourseSection.objects.select_related('course').all()
-    return Response(CourseSectionReadSerializer(sections, many=True).data)
+    """
+    Every section, shaped like CourseSectionReadSerializer.
+
+    Query params (all optional):
+      course_id=<id>[,<id>...]  only sections of these courses
+      fields=<name>[,<name>...] only these keys of each section
+      cursor, page_size         paginate by id; the body becomes
+                                {"next": ..., "previous": ..., "results": [...]}
+
+    Without cursor/page_size the whole list is served from the catalog
+    payload cache (see catalog_response).
+    """
+    try:
+        course_ids = parse_id_list(request.query_params.getlist('course_id'))
+    except ValueError as e:
+        return Response({"course_id": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except ValueError as e:
+        return Response({"fields": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    sections = CourseSection.objects.values(*SECTION_COLUMNS).order_by('id')
+    if course_ids is not None:
+        sections = sections.filter(course_id__in=course_ids)
+
+    params = request.query_params
+    if 'cursor' in params or 'page_size' in params:
+        paginator = SectionCursorPagination()
+        page = paginator.paginate_queryset(sections, request)
+        return paginator.get_paginated_response(section_dicts(page, fields))
+
+    name = "sections"
+    if course_ids is not None or fields is not None:
+        name += ":" + hashlib.sha1(repr((course_ids, fields)).encode()).hexdigest()
+    return catalog_response(request, name,
+                            lambda: JSONRenderer().render(section_dicts(sections, fields)))
 
 @api_view(['POST'])
 @authentication_classes([])   # dev-only
@@ -58,156 +188,672 @@ def create_section(request):
         return Response(rser.data, status=status.HTTP_201_CREATED)
     return Response(wser.errors, status=status.HTTP_400_BAD_REQUEST)
 
-PREFERRED_TIME_WINDOWS = {
-    "morning":  (8 * 60, 12 * 60),   # 08:00–12:00
-    "afternoon": (12 * 60, 16 * 60), # 12:00–16:00
-    "evening":  (16 * 60, 20 * 60),  # 16:00–20:00
-}
 
-def time_to_minutes(t):
-    """Convert a datetime.time to minutes after midnight."""
-    if t is None:
+MAX_TOP_K = 50
+
+
+def parse_top_k(value):
+    """None stays None (single best schedule); otherwise an int in 1..MAX_TOP_K."""
+    if value is None:
         return None
-    return t.hour * 60 + t.minute
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Must be an integer.")
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"Must be between 1 and {MAX_TOP_K}.")
+    return top_k
+
+
+def section_payload(section):
+    """CourseSectionReadSerializer data; snapshot sections carry it ready-made."""
+    if isinstance(section, SnapshotSection):
+        return section.payload
+    return CourseSectionReadSerializer(section).data
+
+
+def schedule_payload(ids, total_credits, score, sections_by_id):
+    return {
+        "sections": [section_payload(sections_by_id[i]) for i in ids],
+        "total_credits": total_credits,
+        "score": score,
+    }
+
+
+class ConflictReportPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
 
-def get_section_days(section):
+
+@api_view(['GET'])
+def conflict_report(request):
     """
-    Normalize days from the model into a list like ['M','W'].
-    Works whether days is a list (MultiSelect) or 'M,W' string.
+    Every pair of sections whose meetings overlap, paginated.
+
+    Query params (all optional):
+      course=<id>        pairs involving a section of this course
+      instructor=<name>  pairs involving a section taught by this instructor
+      day=<M|T|W|Th|F>   only overlaps on this weekday
+      page, page_size
     """
-    d = section.days
-    if isinstance(d, (list, tuple)):
-        return list(d)
-    if d is None:
+    day = request.query_params.get('day') or None
+    if day is not None and day not in DAY_CODES:
+        return Response({"day": f"Must be one of {', '.join(DAY_CODES)}."},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    sections = catalog_snapshot().sections.values()
+    if day is not None:
+        # both sides of a pair meet that day
+        sections = [s for s in sections if s.day_mask & DAY_BITS[day]]
+    conflicts = find_conflicts(
+        sections,
+        course_id=request.query_params.get('course') or None,
+        instructor=request.query_params.get('instructor') or None,
+        day=day,
+    )
+
+    paginator = ConflictReportPagination()
+    page = paginator.paginate_queryset(conflicts, request)
+    return paginator.get_paginated_response([
+        {
+            "section_a": section_payload(a),
+            "section_b": section_payload(b),
+            "days": days,
+        }
+        for a, b, days in page
+    ])
+
+
+@api_view(['POST'])
+@authentication_classes([])   # dev-only
+@permission_classes([AllowAny])
+def bulk_import_sections(request):
+    """
+    Import many courses/sections in one transaction.
+
+    Body: a JSON list of rows (or {"rows": [...]}), or a multipart upload
+    with a CSV/JSON `file`. See scheduler/catalog_import.py for the columns.
+    Add ?dry_run=1 to validate without writing.
+    Returns 201 with counts, or 400 with every row error and nothing written.
+    """
+    upload = request.FILES.get('file')
+    try:
+        if upload is not None:
+            fmt = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            rows = read_rows(upload.read().decode('utf-8'), fmt)
+        else:
+            rows = request.data
+            if isinstance(rows, dict):
+                rows = rows.get('rows', [])
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not isinstance(rows, list):
+        return Response({"detail": "Expected a list of rows."}, status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = request.query_params.get('dry_run') in ('1', 'true')
+    result = import_catalog(rows, dry_run=dry_run)
+    if result["errors"]:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@object_body
+def generate_schedules_api(request):
+    """
+    Body: {"selected_courses": [...], "preferences": {...}, "top_k": 5, "time_budget_ms": 2000}
+
+    Without top_k the response is the single best schedule (or null).
+    With top_k it is {"schedules": [...]} holding up to top_k schedules, best first.
+    Both carry "stats": nodes explored and subtrees pruned by the search.
+
+    time_budget_ms (capped at SCHEDULE_MAX_TIME_BUDGET_MS) makes the search
+    stop when the budget runs out and return the best found so far, with
+    "complete": false. Responses always carry "complete".
+
+    Sections that break earliest_start/avoid_days are dropped before the
+    search. If that leaves too few courses or credits for any schedule,
+    the response is {"infeasible": {"reason": ..., "courses": [...]}} with
+    no search run (plus "schedules": [] with top_k).
+
+    "required_courses" (a subset of selected_courses) must all be in every
+    schedule. Sections that cannot be combined with any section of some
+    required course are pruned before the search (see propagation.py) and
+    listed under "propagation"; a required course left without sections
+    gives an "infeasible" response.
+
+    Complete results are cached per (course set, preferences, top_k, catalog version).
+    """
+    try:
+        selected_ids = parse_course_ids(request.data.get('selected_courses'))
+    except ValueError as e:
+        return Response({"selected_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    prefs = request.data.get('preferences', {}) or {}
+    try:
+        top_k = parse_top_k(request.data.get('top_k'))
+    except ValueError as e:
+        return Response({"top_k": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        budget_ms = parse_time_budget(request.data.get('time_budget_ms'))
+    except ValueError as e:
+        return Response({"time_budget_ms": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        required = parse_required(request.data.get('required_courses'), selected_ids)
+    except ValueError as e:
+        return Response({"required_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    deadline = monotonic() + budget_ms / 1000 if budget_ms else None
+    key = schedule_cache_key(selected_ids, prefs, top_k=top_k, required=required)
+    body = cached_schedules(
+        key,
+        lambda: find_schedules(selected_ids, prefs, top_k, deadline, required),
+        cacheable=lambda body: body is None or body["complete"],
+    )
+    return Response(with_debug(body))
+
+
+def with_debug(body):
+    """Add the request profile as "debug" to a dict body when profiling is on."""
+    profile = current_profile()
+    if profile is None or not isinstance(body, dict):
+        return body
+    return {**body, "debug": profile.snapshot()}
+
+
+def parse_course_ids(value):
+    """A list of course ids as ints; None means none."""
+    if value is None:
         return []
-    return [x.strip() for x in str(d).split(",") if x.strip()]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("Must be a list of course ids.")
+    try:
+        return [int(i) for i in value]
+    except (TypeError, ValueError):
+        raise ValueError("Must be a list of course ids.")
+
 
-def passes_hard_preferences(combo, total_credits, prefs):
+def parse_required(value, selected_ids):
     """
-    Apply hard constraints:
-    - earliest_start: no class before this time
-    - avoid_days: no classes on these days
-    - max_classes_per_day: do not exceed this per day
+    Sorted ids of required courses; each must be one of selected_ids
+    (already parsed with parse_course_ids).
     """
-    earliest_start_str = prefs.get("earliest_start") or None
-    avoid_days = prefs.get("avoid_days") or []
-    max_classes_per_day = prefs.get("max_classes_per_day") or None
+    required = sorted(set(parse_course_ids(value)))
+    if not set(required) <= set(selected_ids):
+        raise ValueError("Must be a subset of selected_courses.")
+    return required
 
-    # Convert start limit to minutes (or None if no preference)
-    earliest_start_min = None
-    if earliest_start_str:
-        try:
-            h, m = earliest_start_str.split(":")
-            earliest_start_min = int(h) * 60 + int(m)
-        except ValueError:
-            pass
-
-    # 1) Check earliest_start
-    if earliest_start_min is not None:
-        for sec in combo:
-            sec_start = time_to_minutes(sec.start_time)
-            if sec_start is not None and sec_start < earliest_start_min:
-                return False
-
-    # 2) Check avoid_days
-    avoid_set = set(avoid_days)
-    if avoid_set:
-        for sec in combo:
-            if avoid_set.intersection(get_section_days(sec)):
-                return False
-
-    # 3) Check max_classes_per_day
-    if max_classes_per_day:
-        try:
-            max_per_day = int(max_classes_per_day)
-        except ValueError:
-            max_per_day = None
-        if max_per_day:
-            day_counts = {}
-            for sec in combo:
-                for d in get_section_days(sec):
-                    day_counts[d] = day_counts.get(d, 0) + 1
-            if any(count > max_per_day for count in day_counts.values()):
-                return False
-
-    # You already enforce 12–18 credits earlier in your logic.
-    return True
-
-def score_schedule(combo, prefs):
-    """
-    Compute a score based on soft preferences.
-    Currently:
-    - preferred_time: morning / afternoon / evening
-      Reward sections whose mid-time lies in that window.
-    """
-    preferred_time = prefs.get("preferred_time") or None
-    if not preferred_time or preferred_time not in PREFERRED_TIME_WINDOWS:
-        return 0  # no soft preferences → neutral score
-
-    start_win, end_win = PREFERRED_TIME_WINDOWS[preferred_time]
-    score = 0
-
-    for sec in combo:
-        start_min = time_to_minutes(sec.start_time)
-        end_min = time_to_minutes(sec.end_time)
-        if start_min is None or end_min is None:
-            continue
-        mid = (start_min + end_min) // 2
-        if start_win <= mid <= end_win:
-            score += 3  # reward sections aligned with preference
 
-    return score
+def parse_time_budget(value):
+    """None stays None (no budget); otherwise a positive int, capped server-side."""
+    if value in (None, ""):
+        return None
+    try:
+        budget = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Must be an integer number of milliseconds.")
+    if budget < 1:
+        raise ValueError("Must be at least 1.")
+    return min(budget, getattr(settings, "SCHEDULE_MAX_TIME_BUDGET_MS", 10_000))
+
+
+def find_schedules(selected_ids, prefs, top_k, deadline=None, required=()):
+    """
+    Response body of generate_schedules_api (see its docstring).
+    """
+    with phase("fetch"):
+        snapshot = catalog_snapshot()
+        sections = snapshot.course_sections(selected_ids, prefs)
+        infeasible = infeasibility(selected_ids, sections, prefs)
+    if infeasible is not None:
+        return infeasible_body(infeasible, top_k)
+
+    with phase("conflicts"):
+        conflicts = snapshot.conflicts(sections)
+
+    return solve_schedules(sections, prefs, top_k, conflicts, deadline, required)
+
+
+def solve_schedules(sections, prefs, top_k, conflicts, deadline=None, required=()):
+    """
+    Search pre-filtered, id-ordered `sections` and shape the response body.
+    `conflicts` may cover more sections than these.
+    """
+    sections, report, infeasible = apply_required(sections, required, conflicts, top_k)
+    if infeasible is not None:
+        return infeasible
+
+    # one section per course, no conflicts, 12–18 credits, hard prefs
+    with phase("search"):
+        if should_parallelize(sections):
+            winners, stats, complete = parallel_top(sections, prefs, top_k or 1, conflicts=conflicts,
+                                                    deadline=deadline, required=required)
+        else:
+            search = ScheduleSearch(sections, prefs, conflicts=conflicts, branch_and_bound=True,
+                                    stop=deadline_stop(deadline), required=required, collapse=True)
+            winners = search.top(top_k or 1)
+            stats, complete = search.stats, search.complete
+    record_search(stats)
+    return result_body(winners, stats, top_k, sections, complete, report)
+
+
+def apply_required(sections, required, conflicts, top_k):
+    """
+    Prune `sections` for the `required` courses (see propagation.py).
+    Returns (sections left, report, infeasible body or None); without
+    required courses, (sections, None, None).
+    """
+    if not required:
+        return sections, None, None
+    with phase("propagate"):
+        sections, report, infeasible = propagate_required(sections, required, conflicts)
+    if infeasible is not None:
+        return sections, report, {**infeasible_body(infeasible, top_k), "propagation": report}
+    return sections, report, None
+
+
+def result_body(winners, stats, top_k, sections, complete, report=None):
+    """schedules_body(), plus the propagation `report` if there is one."""
+    with phase("serialize"):
+        body = schedules_body(winners, stats, top_k, sections, complete)
+    if report is not None:
+        # a dict even when there is no schedule, to carry the report
+        body = {**(body or {"stats": stats, "complete": complete}), "propagation": report}
+    return body
 
 
 @api_view(['POST'])
-def generate_schedules_api(request):
-    selected_ids = request.data.get('selected_courses', [])
+@object_body
+def generate_schedules_session(request):
+    """
+    Like /api/generate-schedules/, but re-solves incrementally from the
+    state of an earlier request (see solver_state.py).
+
+    Body: the generate_schedules_api body plus "session": the token from
+    the previous response (omit it on the first call).
+
+    The response is generate_schedules_api's, plus "session": the token
+    for the next call ("no schedule" is {"complete": ..., "stats": ...,
+    "session": ...} instead of null). stats["mode"] says how the answer
+    was found: new, incremental, rebuild or search. time_budget_ms only
+    limits the search mode; the other modes finish well within it.
+    """
     prefs = request.data.get('preferences', {}) or {}
+    try:
+        selected_ids = parse_course_ids(request.data.get('selected_courses'))
+    except ValueError as e:
+        return Response({"selected_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        top_k = parse_top_k(request.data.get('top_k'))
+    except ValueError as e:
+        return Response({"top_k": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        budget_ms = parse_time_budget(request.data.get('time_budget_ms'))
+    except ValueError as e:
+        return Response({"time_budget_ms": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        required = parse_required(request.data.get('required_courses'), selected_ids)
+    except ValueError as e:
+        return Response({"required_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    deadline = monotonic() + budget_ms / 1000 if budget_ms else None
+
+    token = request.data.get('session') or None
+    state = solver_states.take(token) if token else None
+    fresh = state is None
+    if fresh:
+        state = SolverState(get_catalog_version())
+        token = None  # never adopt a token we did not issue
+
+    limit = getattr(settings, "SCHEDULE_SESSION_MAX_PARTIALS", 50_000)
+    with phase("solve"):
+        mode = state.update(selected_ids, prefs, limit)
+        records = state.sections(selected_ids)
+        infeasible = infeasibility(selected_ids, records, prefs)
+    report = None
+    if infeasible is not None:
+        blocked = infeasible_body(infeasible, top_k)
+    else:
+        # the state's clash sets serve as the conflict graph
+        records, report, blocked = apply_required(records, required, state.clashes, top_k)
+    if blocked is None:
+        with phase("solve"):
+            winners, stats, complete = state.top(selected_ids, prefs, top_k or 1, required,
+                                                 deadline_stop(deadline))
+    token = solver_states.put(state, token)
+
+    if blocked is not None:
+        return Response({**blocked, "session": token})
+
+    stats["mode"] = "new" if fresh and mode != "search" else mode
+    record_search(stats)
+    body = result_body(winners, stats, top_k, records, complete, report)
+    if body is None:
+        body = {"complete": True, "stats": stats}
+    return Response({**with_debug(body), "session": token})
 
-    sections = list(
-        CourseSection.objects
-        .filter(course__id__in=selected_ids)
-        .select_related('course')
+
+@api_view(['POST'])
+@object_body
+def count_schedules_api(request):
+    """
+    How many schedules /api/generate-schedules/ could choose from, counted
+    without building them (see counting.py), for live feedback while a
+    selection is being edited.
+
+    Body: selected_courses, preferences and required_courses as for
+    generate_schedules_api.
+
+    Returns {"count": n, "exact": true, "stats": {...}}. If the count runs
+    past SCHEDULE_COUNT_BUDGET_MS it gives {"exact": false, "lower_bound":
+    n, "upper_bound": n, ...} instead. A selection with no schedule also
+    gets "infeasible": {"reason": ..., "courses": [...]}.
+    """
+    try:
+        selected_ids = parse_course_ids(request.data.get('selected_courses'))
+    except ValueError as e:
+        return Response({"selected_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    prefs = request.data.get('preferences', {}) or {}
+    try:
+        required = parse_required(request.data.get('required_courses'), selected_ids)
+    except ValueError as e:
+        return Response({"required_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    key = schedule_cache_key(selected_ids, prefs, required=required, count=True)
+    body = cached_schedules(
+        key,
+        lambda: count_body(selected_ids, prefs, required),
+        cacheable=lambda body: body["exact"],
     )
+    return Response(with_debug(body))
 
-    valid_schedules = []
 
-    for r in range(2, min(6, len(sections) + 1)):
-        for combo in itertools.combinations(sections, r):
-            # one section per course
-            if len({s.course.id for s in combo}) != len(combo):
-                continue
+def count_body(selected_ids, prefs, required=()):
+    with phase("fetch"):
+        sections = catalog_snapshot().course_sections(selected_ids, prefs)
+        infeasible = infeasibility(selected_ids, sections, prefs)
+    if infeasible is not None:
+        return {"count": 0, "exact": True, "infeasible": infeasible}
 
-            # no time conflicts (your existing helper)
-            if any(has_conflict(a, b) for i, a in enumerate(combo) for b in combo[i+1:]):
-                continue
+    budget_ms = getattr(settings, "SCHEDULE_COUNT_BUDGET_MS", 50)
+    with phase("count"):
+        counter = ScheduleCounter(sections, prefs, required=required,
+                                  stop=deadline_stop(monotonic() + budget_ms / 1000))
+        body = {**counter.count(), "stats": counter.stats}
+    if body["exact"] and not body["count"]:
+        body["infeasible"] = {
+            "reason": "Every combination of these sections has a time conflict or falls "
+                      "outside the credit range.",
+            "courses": [],
+        }
+    return body
 
-            total_credits = sum(s.course.credits for s in combo)
 
-            # full-time only
-            if not (12 <= total_credits <= 18):
-                continue
+MAX_BATCH_REQUESTS = 100
 
-            # apply hard prefs: earliest_start, avoid_days, max_classes_per_day
-            if not passes_hard_preferences(combo, total_credits, prefs):
-                continue
 
-            # compute soft score
-            score = score_schedule(combo, prefs)
+@api_view(['POST'])
+@object_body
+def generate_schedules_batch(request):
+    """
+    Generate schedules for many students in one call.
+
+    Body: {"requests": [{"selected_courses": [...], "preferences": {...}, "top_k": 3,
+                         "required_courses": [...], "time_budget_ms": 500}, ...],
+           "concurrent": false}
+
+    Response: {"results": [...]}, one entry per request in the same order,
+    each exactly what /api/generate-schedules/ would return for it, or
+    {"error": {...}} for an invalid request. A request's time_budget_ms
+    counts from the start of its own search.
+
+    The sections of every requested course are loaded and their conflict
+    graph built once for the whole batch. Identical requests are solved
+    once, and results go through the same cache as the single endpoint.
+    With "concurrent": true (and SCHEDULE_PARALLEL_WORKERS > 1) the
+    searches run side by side in the worker pool.
+    """
+    items = request.data.get('requests')
+    if not isinstance(items, list) or not items:
+        return Response({"requests": "Must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > MAX_BATCH_REQUESTS:
+        return Response({"requests": f"At most {MAX_BATCH_REQUESTS} per batch."},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    keys = []      # per request: cache key, or an error dict
+    unique = {}    # cache key -> (course ids, prefs, top_k, required, budget_ms)
+    for item in items:
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Must be an object.")
+            ids = parse_course_ids(item.get('selected_courses'))
+            prefs = item.get('preferences') or {}
+            top_k = parse_top_k(item.get('top_k'))
+            required = parse_required(item.get('required_courses'), ids)
+            budget_ms = parse_time_budget(item.get('time_budget_ms'))
+        except (TypeError, ValueError) as e:
+            keys.append({"error": {"detail": str(e)}})
+            continue
+        # same key as the single endpoint, which batch requests share
+        key = schedule_cache_key(ids, prefs, top_k=top_k, required=required)
+        unique.setdefault(key, (ids, prefs, top_k, required, budget_ms))
+        keys.append(key)
+
+    bodies = {}
+    misses = {}
+    for key in unique:
+        hit, body = lookup_schedules(key)
+        if hit:
+            bodies[key] = body
+        else:
+            misses[key] = unique[key]
+
+    if misses:
+        union = {i for ids, *_ in misses.values() for i in ids}
+        with phase("fetch"):
+            snapshot = catalog_snapshot()
+            sections = snapshot.course_sections(union)
+        with phase("conflicts"):
+            conflicts = snapshot.conflicts(sections)
+
+        jobs = {}
+        for key, (ids, prefs, top_k, _, _) in misses.items():
+            wanted = set(ids)
+            subset = [s for s in sections if s.course_id in wanted and section_allowed(s, prefs)]
+            infeasible = infeasibility(ids, subset, prefs)
+            if infeasible is not None:
+                bodies[key] = infeasible_body(infeasible, top_k)
+            else:
+                jobs[key] = subset
+
+        concurrent = request.data.get('concurrent') and parallel_workers() > 1 and len(jobs) > 1
+        if concurrent:
+            # the searches start together, so every budget counts from now
+            started = monotonic()
+            searched = {}  # cache key -> (sections left, propagation report)
+            batch = []
+            for key, subset in jobs.items():
+                _, prefs, top_k, required, budget_ms = misses[key]
+                subset, report, blocked = apply_required(subset, required, conflicts, top_k)
+                if blocked is not None:
+                    bodies[key] = blocked
+                    continue
+                searched[key] = (subset, report)
+                deadline = started + budget_ms / 1000 if budget_ms else None
+                batch.append((subset, prefs, conflicts, top_k or 1, deadline, required))
+            with phase("search"):
+                found = search_many(batch)
+            for (key, (subset, report)), (winners, stats, complete) in zip(searched.items(), found):
+                record_search(stats)
+                bodies[key] = result_body(winners, stats, misses[key][2], subset, complete, report)
+        else:
+            for key, subset in jobs.items():
+                _, prefs, top_k, required, budget_ms = misses[key]
+                deadline = monotonic() + budget_ms / 1000 if budget_ms else None
+                bodies[key] = solve_schedules(subset, prefs, top_k, conflicts, deadline, required)
+
+        for key in misses:
+            body = bodies[key]
+            # like the single endpoint: best-so-far results are not cached
+            if body is None or body["complete"]:
+                store_schedules(key, body)
+
+    return Response({"results": [
+        bodies[key] if isinstance(key, str) else key for key in keys
+    ]})
+
+
+def infeasible_body(explanation, top_k):
+    """
+    Response body when the pre-filter already rules out every schedule
+    (see prefilter.infeasibility); no search is run.
+    """
+    body = {"infeasible": explanation, "complete": True}
+    if top_k is not None:
+        body["schedules"] = []
+    return body
 
-            valid_schedules.append({
-                "sections": CourseSectionReadSerializer(combo, many=True).data,
-                "total_credits": total_credits,
-                "score": score,
-            })
 
-    if not valid_schedules:
+def schedules_body(winners, stats, top_k, sections, complete=True):
+    """
+    Shape the search winners like generate_schedules_api's docstring says.
+    """
+    # only the winners get serialized
+    sections_by_id = {s.pk: s for s in sections}
+    schedules = [schedule_payload(*w, sections_by_id) for w in winners]
+
+    if top_k is not None:
+        return {"schedules": schedules, "stats": stats, "complete": complete}
+
+    if not schedules:
+        if not complete:
+            # ran out of time before finding one; there may still be one
+            return {"stats": stats, "complete": False}
         # no schedule found that matches constraints
-        return Response(None)  # frontend will treat as "no schedule"
+        return None  # frontend will treat as "no schedule"
+
+    return {**schedules[0], "stats": stats, "complete": complete}
+
+
+@api_view(['GET'])
+def enrollment_audit(request):
+    """
+    Stream every pair of clashing sections a student is enrolled in for a
+    term, as newline-delimited JSON (see enrollment_audit.audit_term).
+
+    Query params: semester, year (required), student=<id> (optional).
+    """
+    semester = request.query_params.get('semester')
+    if not semester:
+        return Response({"semester": "This parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        year = int(request.query_params.get('year'))
+    except (TypeError, ValueError):
+        return Response({"year": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    student_id = request.query_params.get('student') or None
+    if student_id is not None and not student_id.isdigit():
+        return Response({"student": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+    lines = (json.dumps(clash) + "\n" for clash in audit_term(semester, year, student_id))
+    return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+
+@api_view(['GET'])
+def profiling_metrics(request):
+    """
+    Per-path request timings, query counts and search counters collected
+    in this process while SCHEDULE_PROFILING is on (see profiling.py).
+    """
+    return Response({"enabled": profiling_enabled(), "paths": metrics()})
 
-    # pick the highest scoring schedule
-    best = max(valid_schedules, key=lambda s: s.get("score", 0))
-    # optionally hide score from client if you want:
-    # best.pop("score", None)
 
-    return Response(best)
\ No newline at end of file
+@api_view(['GET'])
+def schedule_cache_stats(request):
+    """Hit/miss counters of the schedule cache in this process, plus the catalog version."""
+    return Response(cache_stats())
+
+
+def encode_cursor(section_ids):
+    return ".".join(str(i) for i in section_ids)
+
+
+def decode_cursor(cursor):
+    return tuple(int(i) for i in str(cursor).split("."))
+
+
+@api_view(['POST'])
+@object_body
+def generate_schedules_stream(request):
+    """
+    Stream every valid schedule as newline-delimited JSON.
+
+    Body: {"selected_courses": [...], "preferences": {...}, "required_courses": [...],
+           "cursor": "...", "limit": 100}
+
+    Each line is {"sections": [...], "total_credits": ..., "score": ..., "cursor": "..."}.
+    Posting a line's cursor back (with the same body otherwise) resumes the
+    stream right after that schedule.
+    limit is optional; without it the stream runs to the end.
+    time_budget_ms is not supported (a 400): stop reading instead.
+    """
+    try:
+        selected_ids = parse_course_ids(request.data.get('selected_courses'))
+    except ValueError as e:
+        return Response({"selected_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    prefs = request.data.get('preferences', {}) or {}
+    cursor = request.data.get('cursor') or None
+    limit = request.data.get('limit')
+
+    if request.data.get('time_budget_ms') not in (None, ""):
+        return Response({"time_budget_ms": "Not supported when streaming; use limit."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        required = parse_required(request.data.get('required_courses'), selected_ids)
+    except ValueError as e:
+        return Response({"required_courses": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response({"cursor": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"limit": "Must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # stable order so cursors mean the same thing on the next request
+    snapshot = catalog_snapshot()
+    sections = sorted(snapshot.course_sections(selected_ids, prefs), key=lambda s: (s.course_id, s.pk))
+    conflicts = snapshot.conflicts(sections)
+    search = ScheduleSearch(sections, prefs, conflicts=conflicts, required=required)
+
+    schedules = search.stream(after=after)
+    try:
+        # surface a bad cursor as a 400 before the response starts
+        first = next(schedules, None)
+    except ValueError as e:
+        return Response({"cursor": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    sections_by_id = {s.pk: s for s in sections}
+
+    def lines():
+        if first is None:
+            return
+        sent = 0
+        for ids, total_credits, score in itertools.chain([first], schedules):
+            row = {
+                "sections": [sections_by_id[i].payload for i in ids],
+                "total_credits": total_credits,
+                "score": score,
+                "cursor": encode_cursor(ids),
+            }
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+            sent += 1
+            if limit is not None and sent >= limit:
+                return
+
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
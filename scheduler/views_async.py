@@ -0,0 +1,117 @@
+"""
+Async variant of the generate-schedules endpoint for ASGI deployments.
+
+Sections come from the catalog snapshot and the CPU-bound search runs in a
+small, bounded thread pool, so the event loop keeps serving other requests
+(catalog GETs included) while a slow search is running. The search stops
+when the request task is cancelled, which tessera/asgi.py does when the
+client disconnects, or when its deadline passes.
+"""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from .prefilter import infeasibility
+from .profiling import phase, record_search
+from .search import ScheduleSearch
+from .snapshot import catalog_snapshot
+from .views_api import (NOT_AN_OBJECT, apply_required, infeasible_body, parse_course_ids, parse_required,
+                        parse_time_budget, parse_top_k, result_body, with_debug)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def search_executor():
+    """
+    Shared pool for searches; its size bounds how many run at once.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "SCHEDULE_ASYNC_WORKERS", 4),
+                thread_name_prefix="schedule-search",
+            )
+        return _executor
+
+
+async def generate_schedules_async(request):
+    """
+    Same body and response as /api/generate-schedules/ (without the cache).
+    Responds 504 if the search runs past SCHEDULE_REQUEST_TIMEOUT seconds;
+    a shorter time_budget_ms gives best-so-far results instead.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        data = json.loads(request.body or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError(NOT_AN_OBJECT)
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+    # errors are reported under the field they belong to, as on the sync endpoint
+    try:
+        field = 'selected_courses'
+        selected_ids = parse_course_ids(data.get(field))
+        field = 'top_k'
+        top_k = parse_top_k(data.get(field))
+        field = 'time_budget_ms'
+        budget_ms = parse_time_budget(data.get(field))
+        field = 'required_courses'
+        required = parse_required(data.get(field), selected_ids)
+    except ValueError as e:
+        return JsonResponse({field: str(e)}, status=400)
+
+    prefs = data.get('preferences', {}) or {}
+
+    with phase("fetch"):
+        # only touches the database when the catalog has changed
+        snapshot = await sync_to_async(catalog_snapshot)()
+        sections = snapshot.course_sections(selected_ids, prefs)
+        infeasible = await sync_to_async(infeasibility)(selected_ids, sections, prefs)
+    if infeasible is not None:
+        return JsonResponse(with_debug(infeasible_body(infeasible, top_k)))
+    with phase("conflicts"):
+        conflicts = snapshot.conflicts(sections)
+    # may query course codes for the infeasible explanation
+    sections, report, blocked = await sync_to_async(apply_required)(sections, required, conflicts, top_k)
+    if blocked is not None:
+        return JsonResponse(with_debug(blocked))
+
+    cancelled = threading.Event()
+    now = time.monotonic()
+    deadline = now + getattr(settings, "SCHEDULE_REQUEST_TIMEOUT", 10)
+    budget_deadline = now + budget_ms / 1000 if budget_ms else deadline
+    search = ScheduleSearch(
+        sections, prefs, conflicts=conflicts, branch_and_bound=True, collapse=True, required=required,
+        stop=lambda: cancelled.is_set() or time.monotonic() > min(deadline, budget_deadline),
+    )
+
+    loop = asyncio.get_running_loop()
+    try:
+        with phase("search"):
+            winners = await loop.run_in_executor(search_executor(), search.top, top_k or 1)
+    except asyncio.CancelledError:
+        # the client disconnected: let the worker thread wind down too
+        cancelled.set()
+        raise
+    record_search(search.stats)
+
+    if not search.complete and budget_deadline >= deadline:
+        # no (shorter) budget asked for: the server timeout is an error
+        return JsonResponse({"detail": "Schedule search timed out."}, status=504)
+
+    body = result_body(winners, search.stats, top_k, sections, search.complete, report)
+    return JsonResponse(with_debug(body), safe=False)
+
+
+# Django 4.2's csrf_exempt/require_POST wrap views in sync functions, so set
+# the flag directly. dev-only, like the DRF write endpoints.
+generate_schedules_async.csrf_exempt = True
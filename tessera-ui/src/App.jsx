@@ -76,6 +76,8 @@ export default function App() {
   });
 
   const [error, setError] = useState("");
+  const [partial, setPartial] = useState(false);
+  const [count, setCount] = useState(null);
 
   // --- data fetching ---
 
@@ -110,6 +112,28 @@ export default function App() {
     }
   }, [schedules]);
 
+  // --- live schedule count ---
+
+  useEffect(() => {
+    if (selected.length === 0) {
+      setCount(null);
+      return;
+    }
+    const controller = new AbortController();
+    fetch("/api/generate-schedules/count/", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ selected_courses: selected, preferences }),
+      signal: controller.signal,
+    })
+      .then((r) => r.json())
+      .then(setCount)
+      .catch((e) => {
+        if (e.name !== "AbortError") console.error("Count fetch failed:", e);
+      });
+    return () => controller.abort();
+  }, [selected, preferences]);
+
   // --- selection toggle ---
 
   const toggle = (id) =>
@@ -127,6 +151,7 @@ export default function App() {
 
     setLoading(true);
     setError("");
+    setPartial(false);
 
     fetch("/api/generate-schedules/", {
       method: "POST",
@@ -134,6 +159,7 @@ export default function App() {
       body: JSON.stringify({
         selected_courses: selected,
         preferences: preferences,
+        time_budget_ms: 5000,
       }),
     })
       .then(async (r) => {
@@ -157,6 +183,17 @@ export default function App() {
           // got a valid schedule
           setSchedules([data]);
           setGeneratedAt(new Date().toISOString());
+          setPartial(data.complete === false);
+        } else if (data && data.infeasible) {
+          // ruled out by the preferences before searching
+          setSchedules([]);
+          setGeneratedAt(null);
+          setError(data.infeasible.reason);
+        } else if (data && data.complete === false) {
+          // the time budget ran out before any schedule was found
+          setSchedules([]);
+          setGeneratedAt(null);
+          setError("The search ran out of time. Try selecting fewer courses.");
         } else {
           // treat "no data" or empty response as "no schedule"
           setSchedules([]);
@@ -178,6 +215,7 @@ export default function App() {
     setSchedules([]);
     setGeneratedAt(null);
     setError("");
+    setPartial(false);
   };
 
   // --- render ---
@@ -248,6 +286,15 @@ export default function App() {
           >
             Clear results
           </button>
+          {count && (
+            <span className={`text-sm ${count.infeasible ? "text-amber-700" : "text-gray-600"}`}>
+              {count.infeasible
+                ? count.infeasible.reason
+                : count.exact
+                ? `${count.count.toLocaleString()} possible schedules`
+                : `${count.lower_bound.toLocaleString()}–${count.upper_bound.toLocaleString()} possible schedules`}
+            </span>
+          )}
         </div>
 
         {error && (
@@ -275,6 +322,12 @@ export default function App() {
           </p>
         )}
 
+        {schedules.length > 0 && partial && (
+          <p className="mt-3 text-sm text-amber-700">
+            The search stopped early, so this schedule may not be the best one.
+          </p>
+        )}
+
         {schedules.length > 0 && (
           <>
             <ScheduleSummary schedule={schedules[0]} />
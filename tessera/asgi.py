@@ -7,10 +7,60 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tessera.settings')
 
-application = get_asgi_application()
+
+class CancelOnDisconnect:
+    """
+    Cancel the request task when the client disconnects before the response
+    is done, so async views (scheduler/views_async.py) can stop their work.
+    Django only reads `receive` while loading the request body, so after
+    that this wrapper listens for http.disconnect itself.
+
+    Only requests for `paths` are watched; everything else goes straight
+    to the app, untouched.
+    """
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") not in self.paths:
+            return await self.app(scope, receive, send)
+
+        body_read = asyncio.Event()
+        disconnected = False
+
+        async def app_receive():
+            message = await receive()
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        app_task = asyncio.ensure_future(self.app(scope, app_receive, send))
+
+        async def watch():
+            nonlocal disconnected
+            await body_read.wait()
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected = True
+                app_task.cancel()
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+        finally:
+            watcher.cancel()
+
+
+application = CancelOnDisconnect(get_asgi_application(), paths=['/api/generate-schedules/async/'])
@@ -51,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'scheduler.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'tessera.urls'
@@ -107,6 +108,52 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tessera',
+    }
+}
+
+# Seconds a process may keep using the catalog version it read from the
+# database (scheduler/caching.py). Writes update it in the cache at once, so
+# with a shared cache backend every process sees them immediately.
+SCHEDULE_CATALOG_VERSION_TTL = 5
+
+# Seconds a generated schedule result stays cached. Results are also keyed
+# by catalog version, so writes never serve stale schedules.
+SCHEDULE_CACHE_TIMEOUT = 300
+
+# Schedule search in worker processes (scheduler/parallel.py). 0 or 1 keeps
+# it in the request thread; otherwise searches whose space (product of
+# sections+1 per course) reaches the threshold are split across workers.
+SCHEDULE_PARALLEL_WORKERS = 0
+SCHEDULE_PARALLEL_THRESHOLD = 200_000
+
+# Async generate endpoint (scheduler/views_async.py): searches running at
+# once per process, and seconds before a search is abandoned.
+SCHEDULE_ASYNC_WORKERS = 4
+SCHEDULE_REQUEST_TIMEOUT = 10
+
+# Upper bound for the time_budget_ms a client may ask the search for.
+SCHEDULE_MAX_TIME_BUDGET_MS = 10_000
+
+# Per-request phase timings, query counts and search counters, exposed as
+# Server-Timing headers, a "debug" response field and /api/metrics/.
+SCHEDULE_PROFILING = False
+
+# Milliseconds /api/generate-schedules/count/ may spend counting before it
+# answers with bounds instead of an exact count.
+SCHEDULE_COUNT_BUDGET_MS = 50
+
+# Incremental re-solve state (scheduler/solver_state.py), per process.
+SCHEDULE_SESSION_MAX_STATES = 128
+SCHEDULE_SESSION_MAX_PARTIALS = 50_000
+SCHEDULE_SESSION_TTL = 1800
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema'
 }
@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from scheduler import views_api
+from scheduler import views_api, views_async
 from rest_framework.documentation import include_docs_urls
 
 urlpatterns = [
@@ -25,6 +25,16 @@ urlpatterns = [
     path('api/courses/create/', views_api.create_course),
     path('api/sections/', views_api.get_sections),
     path('api/sections/create/', views_api.create_section),
+    path('api/sections/bulk/', views_api.bulk_import_sections),
+    path('api/sections/conflicts/', views_api.conflict_report),
     path('api/generate-schedules/', views_api.generate_schedules_api),
+    path('api/generate-schedules/stream/', views_api.generate_schedules_stream),
+    path('api/generate-schedules/cache-stats/', views_api.schedule_cache_stats),
+    path('api/generate-schedules/async/', views_async.generate_schedules_async),
+    path('api/generate-schedules/batch/', views_api.generate_schedules_batch),
+    path('api/generate-schedules/session/', views_api.generate_schedules_session),
+    path('api/generate-schedules/count/', views_api.count_schedules_api),
+    path('api/enrollments/audit/', views_api.enrollment_audit),
+    path('api/metrics/', views_api.profiling_metrics),
     path('api/docs/', include_docs_urls(title='Tessera API')),
 ]